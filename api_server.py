@@ -0,0 +1,268 @@
+"""Headless JSON API over the cost-of-living metrics.
+
+Run with ``python api_server.py [port]`` (default 8765). Every endpoint is
+a GET returning JSON:
+
+    /cities                                   all city names
+    /city?name=Pune                           metrics of one city
+    /compare?city=Pune&city=Delhi             metrics of several cities
+    /ranking?k=5[&item=..&qty=..][&budget=]   affordability top-k (see recommend.py)
+    /budget-fit?budget=30000                  cities whose Total Cost fits the budget
+    /basket?item=..&qty=..[&item=..&qty=..]   basket cost in every city, cheapest first
+    /rank?city=Pune[&column=..]               dense rank / percentile of a city (every column by default)
+    /top?column=Rent&k=10[&order=asc]         k highest (or lowest) cities in one column
+    /regions?column=Rent[&stat=median]        regions ranked by one statistic of a column
+    /region?name=West[&column=..]             count / mean / quartiles of every column in one region
+
+Responses are cached in-process (LRU) on the path, the query and the
+dataset version, so repeated lookups never touch pandas. Errors are JSON
+too: ``{"error": ...}`` with 400/404 for bad requests, 503 while the
+data file is missing or unreadable and 500 for anything unexpected. The data file is
+watched (refresh.py), so scraper updates are served without a restart.
+"""
+import json
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from city_metrics import load_city_metrics
+from cost_data import DATA_FILE, dataset_version
+from rank_index import load_rank_index
+from recommend import basket_cost, recommend
+from refresh import start_watcher
+from regions import STATS, load_region_stats
+
+
+CACHE_SIZE = 1024
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class DataUnavailable(Exception):
+    """The data file is missing, unreadable or caught mid-write; answered with 503 and never cached."""
+
+
+# What dataset_version / load_city_metrics raise for such a file
+DATA_ERRORS = (OSError, KeyError, ValueError)
+
+
+def _error(status: int, message: str) -> tuple:
+    return status, json.dumps({'error': message}).encode()
+
+
+def _records(df) -> list:
+    # to_json turns NaN into null, which json.dumps would not
+    return json.loads(df.to_json(orient='records'))
+
+
+def _one(query, name, cast=str, default=None):
+    values = query.get(name)
+    if not values:
+        if default is None:
+            raise ApiError(400, f"Missing query parameter: {name}")
+        return default
+    try:
+        return cast(values[0])
+    except ValueError:
+        raise ApiError(400, f"Invalid value for {name}: {values[0]!r}")
+
+
+def _weights(query, metrics) -> dict:
+    items, qtys = query.get('item', []), query.get('qty', [])
+    if len(items) != len(qtys):
+        raise ApiError(400, "Every item needs a matching qty")
+    unknown = [item for item in items if item not in metrics.items]
+    if unknown:
+        raise ApiError(404, f"Unknown item: {unknown[0]}")
+    try:
+        return {item: float(qty) for item, qty in zip(items, qtys)}
+    except ValueError:
+        raise ApiError(400, "qty must be a number")
+
+
+def city(metrics, query):
+    name = _one(query, 'name')
+    df = metrics.frame([name])
+    if df.empty:
+        raise ApiError(404, f"Unknown city: {name}")
+    return _records(df)[0]
+
+
+def compare(metrics, query):
+    return _records(metrics.frame(query.get('city', [])))
+
+
+def ranking(metrics, query):
+    k = _one(query, 'k', int, 5)
+    if k < 1:
+        raise ApiError(400, "k must be at least 1")
+    budget = _one(query, 'budget', float, 0.0)
+    weights = _weights(query, metrics) or None
+    return _records(recommend(metrics, weights, budget, k))
+
+
+def budget_fit(metrics, query):
+    budget = _one(query, 'budget', float)
+    total = metrics.metric('Total Cost')
+    rows = np.flatnonzero(total <= budget)
+    df = metrics.frame(metrics.city[rows])
+    df['Surplus'] = budget - total[rows]
+    return _records(df)
+
+
+def basket(metrics, query):
+    weights = _weights(query, metrics)
+    if not weights:
+        raise ApiError(400, "Give at least one item/qty pair")
+    cost = basket_cost(metrics, weights)
+    order = np.argsort(cost, kind='stable')
+    return [{'City': metrics.city[i], 'Basket Cost': float(cost[i])} for i in order]
+
+
+def rank(metrics, query):
+    ranks = load_rank_index(metrics)
+    name = _one(query, 'city')
+    if not len(metrics.positions([name])):
+        raise ApiError(404, f"Unknown city: {name}")
+    columns = query.get('column') or ranks.columns
+    unknown = [col for col in columns if col not in ranks.columns]
+    if unknown:
+        raise ApiError(404, f"Unknown column: {unknown[0]}")
+    out = []
+    for col in columns:
+        dense, distinct, percentile = ranks.rank(name, col)
+        out.append({'Column': col, 'Rank': dense, 'Distinct': distinct,
+                    'Percentile': None if np.isnan(percentile) else percentile})
+    return out
+
+
+def top(metrics, query):
+    ranks = load_rank_index(metrics)
+    column = _one(query, 'column')
+    if column not in ranks.columns:
+        raise ApiError(404, f"Unknown column: {column}")
+    k = _one(query, 'k', int, 10)
+    if k < 1:
+        raise ApiError(400, "k must be at least 1")
+    rows = ranks.top(column, k, descending=_one(query, 'order', str, 'desc') != 'asc')
+    values = metrics.price(column) if column in metrics.items else metrics.metric(column)
+    return [{'City': metrics.city[i], column: float(values[i])} for i in rows]
+
+
+def region_ranking(metrics, query):
+    stats = load_region_stats(metrics)
+    column = _one(query, 'column')
+    if column not in stats.columns:
+        raise ApiError(404, f"Unknown column: {column}")
+    stat = _one(query, 'stat', str, 'median')
+    if stat not in STATS:
+        raise ApiError(400, f"stat must be one of {', '.join(STATS)}")
+    return _records(stats.rank_regions(column, stat, descending=_one(query, 'order', str, 'asc') == 'desc'))
+
+
+def region(metrics, query):
+    stats = load_region_stats(metrics)
+    name = _one(query, 'name')
+    if name not in stats.present():
+        raise ApiError(404, f"Unknown region: {name}")
+    columns = query.get('column') or stats.columns
+    unknown = [col for col in columns if col not in stats.columns]
+    if unknown:
+        raise ApiError(404, f"Unknown column: {unknown[0]}")
+    return {'Region': name, 'Cities': list(stats.cities_in(name)), 'Stats': _records(stats.summary(name, columns))}
+
+
+ROUTES = {
+    '/cities': lambda metrics, query: list(metrics.city),
+    '/city': city,
+    '/compare': compare,
+    '/ranking': ranking,
+    '/budget-fit': budget_fit,
+    '/basket': basket,
+    '/rank': rank,
+    '/top': top,
+    '/regions': region_ranking,
+    '/region': region,
+}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def respond(path: str, query_items: tuple, version: str, data_file: str = DATA_FILE):
+    """(status, JSON bytes) for one request; memoised on path, query and dataset version."""
+    handler = ROUTES.get(path)
+    if handler is None:
+        return _error(404, f"Unknown endpoint: {path}")
+    query = {}
+    for key, value in query_items:
+        query.setdefault(key, []).append(value)
+    try:
+        metrics = load_city_metrics(data_file)
+    except DATA_ERRORS as e:
+        # Raised, not returned, so lru_cache does not keep the failure
+        raise DataUnavailable(str(e)) from e
+    try:
+        body = handler(metrics, query)
+    except ApiError as e:
+        return _error(e.status, str(e))
+    return 200, json.dumps(body, ensure_ascii=False).encode()
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    data_file = DATA_FILE
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        # Order of different parameters does not matter for the answer, so it must not matter
+        # for the cache; repeated parameters (city=, item=/qty=) keep their order
+        query_items = tuple(sorted(((k, v) for k, vs in parse_qs(url.query).items() for v in vs), key=lambda kv: kv[0]))
+        try:
+            try:
+                version = dataset_version(self.data_file)
+            except DATA_ERRORS as e:
+                raise DataUnavailable(str(e)) from e
+            status, body = respond(url.path.rstrip('/') or '/', query_items, version, self.data_file)
+        except DataUnavailable as e:
+            status, body = _error(503, f"Data unavailable: {e}")
+        except Exception as e:  # answered as JSON instead of dropping the connection
+            status, body = _error(500, f"Internal error: {type(e).__name__}")
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8765, data_file: str = DATA_FILE) -> ThreadingHTTPServer:
+    """Build (but do not start) a server; port 0 picks a free port, handy for local tests."""
+    handler = type('BoundApiHandler', (ApiHandler,), {'data_file': data_file})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve_in_background(host: str = '127.0.0.1', port: int = 0, data_file: str = DATA_FILE) -> ThreadingHTTPServer:
+    """Start a server on a daemon thread and return it; call ``shutdown()`` when done."""
+    server = make_server(host, port, data_file)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    import sys
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server = make_server(port=port)
+    start_watcher(DATA_FILE)
+    print(f"Serving cost-of-living API on http://127.0.0.1:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
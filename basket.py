@@ -0,0 +1,128 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+# dataset version -> read-only price matrix with missing prices as 0, shared by every session's basket
+_zeroed = {}
+_lock = threading.Lock()
+
+
+def zeroed_prices(metrics) -> np.ndarray:
+    """metrics.prices with NaN as 0, built once per dataset version (the matrix itself if nothing is missing)."""
+    prices = _zeroed.get(metrics.version)
+    if prices is None:
+        with _lock:
+            prices = _zeroed.get(metrics.version)
+            if prices is None:
+                prices = metrics.prices
+                if np.isnan(prices).any():
+                    prices = np.nan_to_num(prices)
+                    prices.flags.writeable = False
+                _zeroed.clear()
+                _zeroed[metrics.version] = prices
+    return prices
+
+
+class BasketCalculator:
+    """Custom basket over every item column, priced in every city.
+
+    Holds the quantity vector and the per-city basket totals; the price
+    matrix is the shared read-only one from ``zeroed_prices``, so a
+    session's basket costs two vectors, not a copy of the data. Changing
+    one item's quantity adjusts the totals by ``delta * price column``,
+    which is O(cities) instead of re-pricing the whole basket. The totals
+    are rebuilt from scratch every ``REBUILD_EVERY`` updates so
+    floating-point drift from the running sums cannot accumulate.
+    """
+
+    REBUILD_EVERY = 1000
+
+    def __init__(self, metrics, quantities: dict = None):
+        self.version = metrics.version
+        self.items = metrics.items
+        self.city = metrics.city
+        self._item_pos = {item: j for j, item in enumerate(self.items)}
+        self._positions = metrics.positions
+        self._prices = zeroed_prices(metrics)
+        self.quantities = np.zeros(len(self.items))
+        for item, qty in (quantities or {}).items():
+            self.quantities[self._item_pos[item]] = qty
+        self._rebuild()
+
+    def _rebuild(self):
+        self.totals = self._prices @ self.quantities
+        self._updates = 0
+
+    def set_quantity(self, item: str, qty: float):
+        """Change one item's quantity and update every city's total in O(cities)."""
+        j = self._item_pos[item]
+        delta = qty - self.quantities[j]
+        if delta == 0:
+            return
+        self.quantities[j] = qty
+        self._updates += 1
+        if self._updates >= self.REBUILD_EVERY:
+            self._rebuild()
+        else:
+            self.totals += delta * self._prices[:, j]
+
+    def update(self, quantities: dict):
+        """Apply only the quantities that differ from the current basket."""
+        for item, qty in quantities.items():
+            self.set_quantity(item, float(qty))
+
+    def total(self, city: str) -> float:
+        rows = self._positions([city])
+        return float(self.totals[rows[0]]) if len(rows) else float('nan')
+
+    def refresh(self, metrics) -> bool:
+        """Follow a patched dataset by re-pricing only its changed cities; False if a rebuild is needed."""
+        if metrics.parent_version != self.version or not metrics.same_rows:
+            return False
+        rows = metrics.positions(sorted(metrics.changed))
+        self._prices = zeroed_prices(metrics)
+        self._positions = metrics.positions
+        self.city = metrics.city
+        self.totals[rows] = self._prices[rows] @ self.quantities
+        self.version = metrics.version
+        return True
+
+    def quantity_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'Item': self.items, 'Quantity': self.quantities.copy()})
+
+    def breakdown(self, city: str) -> pd.DataFrame:
+        """Cost of each item with a non-zero quantity in one city."""
+        i = self._positions([city])[0]
+        used = np.flatnonzero(self.quantities)
+        return pd.DataFrame({
+            'Item': np.asarray(self.items, dtype=object)[used],
+            'Quantity': self.quantities[used],
+            'Unit Price': self._prices[i, used],
+            'Cost': self.quantities[used] * self._prices[i, used],
+        })
+
+    def ranking(self, k: int = None) -> pd.DataFrame:
+        """Cities ordered from cheapest to most expensive basket (top ``k`` only if given)."""
+        if k is not None and k < len(self.totals):
+            top = np.argpartition(self.totals, k - 1)[:k]
+            order = top[np.argsort(self.totals[top], kind='stable')]
+        else:
+            order = np.argsort(self.totals, kind='stable')
+        return pd.DataFrame({
+            'Rank': np.arange(1, len(order) + 1),
+            'City': self.city[order],
+            'Basket Cost': self.totals[order],
+        })
+
+
+def session_basket(session_state, metrics, defaults: dict = None) -> BasketCalculator:
+    """The session's basket, carried across reruns and rebuilt when the dataset changes."""
+    calc = session_state.get('basket')
+    if calc is None or (calc.version != metrics.version and not calc.refresh(metrics)):
+        quantities = defaults if calc is None else dict(zip(calc.items, calc.quantities))
+        quantities = {item: qty for item, qty in (quantities or {}).items() if item in metrics.items}
+        calc = BasketCalculator(metrics, quantities)
+        session_state['basket'] = calc
+    return calc
@@ -0,0 +1,41 @@
+"""Micro-benchmark: per-column clean_numeric vs the single-pass parse_prices.
+
+Run from the repository root:  python benchmarks/bench_price_parser.py [rows ...]
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cost_data import DATA_FILE, clean_numeric  # noqa: E402
+from price_parser import parse_prices  # noqa: E402
+
+
+def old_clean(raw: pd.DataFrame) -> np.ndarray:
+    """What the dashboards did: one regex pass per column."""
+    columns = [col for col in raw.columns if col != 'City']
+    return np.column_stack([clean_numeric(raw[col]).to_numpy() for col in columns])
+
+
+def tiled(raw: pd.DataFrame, rows: int) -> pd.DataFrame:
+    reps = -(-rows // len(raw))
+    return pd.concat([raw] * reps, ignore_index=True).iloc[:rows]
+
+
+def main(sizes):
+    raw = pd.read_csv(DATA_FILE, dtype=str)
+    print(f"{'rows':>8} {'clean_numeric (s)':>18} {'parse_prices (s)':>17} {'speedup':>8}")
+    for rows in sizes:
+        frame = tiled(raw, rows)
+        number = max(1, 2000 // rows)
+        old = min(timeit.repeat(lambda: old_clean(frame), number=number, repeat=3)) / number
+        new = min(timeit.repeat(lambda: parse_prices(frame), number=number, repeat=3)) / number
+        print(f"{rows:>8} {old:>18.5f} {new:>17.5f} {old / new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [18, 1000, 10000, 100000])
@@ -0,0 +1,240 @@
+"""Benchmark suite for the data pipeline and the per-page computations.
+
+Each case runs on synthetic datasets of 16, 1k, 100k and 1M cities. The
+``legacy`` cases are the code paths of dashh10.py / dashhh11.py (regex
+clean per column, copy + full sort); the others are the current shared
+data layer used by dashhh12.py. Results are written to
+benchmarks/results/<label>.json so two runs can be compared:
+
+    python benchmarks/run_benchmarks.py --label before
+    python benchmarks/run_benchmarks.py --label after --sizes 16,1000
+    python benchmarks/run_benchmarks.py --compare before after
+
+Every results file records a fingerprint of the synthetic data it was
+measured on; --compare refuses two runs whose fingerprints differ, since
+their timings are not comparable.
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from city_map import CITY_REGION  # noqa: E402
+from city_metrics import METRIC_COLUMNS, CityMetrics  # noqa: E402
+from cost_data import REQUIRED_COLS, clean_numeric, derive_metrics  # noqa: E402
+from price_parser import parse_prices  # noqa: E402
+from rank_index import RankIndex, ranked_frame  # noqa: E402
+from recommend import recommend  # noqa: E402
+from regions import RegionStats  # noqa: E402
+from synth_data import generate_frame  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+DEFAULT_SIZES = [16, 1_000, 100_000, 1_000_000]
+# Rows hashed for the dataset fingerprint (generation is deterministic, so a sample identifies it)
+FINGERPRINT_ROWS = 1_000
+
+# Required columns plus a few others, so the wide-table cases touch more than the derive step
+EXTRA_ITEMS = [
+    'Cappuccino (regular)',
+    'Eggs (regular) (12)',
+    'Apartment (1 bedroom) Outside of Centre',
+    'Gasoline (1 liter)',
+]
+
+
+# -------------------- Synthetic data --------------------
+def synthetic_raw(n_cities: int, seed: int = 0) -> pd.DataFrame:
+    """Raw CSV-shaped frame ("1,234.50 ₹" strings) for ``n_cities`` made-up cities."""
+    return generate_frame(n_cities, seed=seed, columns=list(REQUIRED_COLS) + EXTRA_ITEMS)
+
+
+def dataset_fingerprint() -> str:
+    """Hash of the synthetic data the cases run on; changes whenever the generator or its columns do."""
+    return hashlib.sha1(synthetic_raw(FINGERPRINT_ROWS).to_csv(index=False).encode('utf-8')).hexdigest()[:16]
+
+
+# -------------------- Legacy code paths (dashh10.py / dashhh11.py) --------------------
+def legacy_recommend_city(df):
+    df = df.copy()
+    df['Affordability Score'] = clean_numeric(df['Average Monthly Net Salary (After Tax)']) / (
+        clean_numeric(df['Apartment (1 bedroom) in City Centre']) +
+        clean_numeric(df['Monthly Pass (Regular Price)']) +
+        clean_numeric(df['Milk (regular), (1 liter)']) +
+        clean_numeric(df['Rice (white), (1kg)'])
+    )
+    df['Affordability Score'] = df['Affordability Score'].replace([np.inf, -np.inf], 0).fillna(0)
+    return df.sort_values(by='Affordability Score', ascending=False).head(5)
+
+
+def legacy_eda_sorts(data):
+    top_rent = data.sort_values(by='Rent', ascending=False).head(10)
+    by_afford = data.sort_values('Affordability Index', ascending=False)
+    by_city = data.sort_values(by="City")
+    return top_rent, by_afford, by_city
+
+
+def legacy_tab_filters(data, city, compare):
+    filtered_df = data[data["City"].isin([city])].copy()
+    compare_df = data[data["City"].isin(compare)].copy()
+    fits = data[data['Total Cost'] <= 30000]
+    return filtered_df, compare_df, fits
+
+
+def legacy_region_stats(data):
+    cities = [city for city, region in CITY_REGION.items() if region == 'West']
+    in_region = data[data["City"].isin(cities)]
+    by_region = data.assign(Region=data['City'].map(CITY_REGION).fillna('Other'))
+    summary = by_region.groupby('Region')[METRIC_COLUMNS].agg(['mean', 'median', 'min', 'max'])
+    return in_region, summary, summary[('Total Cost', 'median')].sort_values()
+
+
+# -------------------- Current code paths --------------------
+def parsed_table(raw):
+    parsed = parse_prices(raw)
+    table = pd.DataFrame(parsed.values, columns=parsed.columns)
+    table.insert(0, 'City', raw['City'].to_numpy(dtype=object))
+    return table
+
+
+def eda_summary(data):
+    cols = ['Salary', 'Rent', 'Groceries', 'Transport', 'Total Cost', 'Affordability Index']
+    stats = data[cols].agg(['mean', 'median', 'std'])
+    corr = data.select_dtypes(include=[np.number]).corr()
+    top_rent = data.nlargest(10, 'Rent')
+    return stats, corr, top_rent
+
+
+def eda_sorts(metrics, ranks):
+    top_rent = ranked_frame(metrics, ranks.top('Rent', 10))
+    by_afford = ranks.sorted_rows('Affordability Index', descending=True)
+    by_city = ranks.city_order
+    return top_rent, by_afford, by_city
+
+
+def tab_filters(metrics, city, compare):
+    filtered_df = metrics.frame([city])
+    compare_df = metrics.frame(compare)
+    fits = metrics.city[metrics.metric('Total Cost') <= 30000]
+    return filtered_df, compare_df, fits
+
+
+def region_lookups(metrics, regions):
+    in_region = metrics.frame(regions.cities_in('West'))
+    return in_region, regions.stat_frame('median', METRIC_COLUMNS), regions.rank_regions('Total Cost')
+
+
+def cases(n_cities):
+    """(name, callable) pairs for one dataset size; setup happens here, outside the timings."""
+    raw = synthetic_raw(n_cities)
+    legacy_data = derive_metrics(raw)
+    table = parsed_table(raw)
+    metrics = CityMetrics.from_frame(derive_metrics(table), version='bench')
+    metrics_frame = metrics.frame()
+    ranks = RankIndex(metrics)
+    regions = RegionStats(metrics)
+    city = raw['City'].iloc[n_cities // 2]
+    compare = raw['City'].iloc[: min(5, n_cities)].tolist()
+    salary_col = raw['Average Monthly Net Salary (After Tax)']
+    return [
+        ('clean_numeric (1 column)', lambda: clean_numeric(salary_col)),
+        ('parse_prices (all columns)', lambda: parse_prices(raw)),
+        ('legacy derive (regex per column)', lambda: derive_metrics(raw)),
+        ('CityMetrics build (parsed table)', lambda: CityMetrics.from_frame(table)),
+        ('legacy recommend_city', lambda: legacy_recommend_city(raw)),
+        ('recommend (top-k)', lambda: recommend(metrics)),
+        ('legacy EDA summary + corr', lambda: eda_summary(legacy_data)),
+        ('EDA summary + corr', lambda: eda_summary(metrics_frame)),
+        ('legacy EDA sorts', lambda: legacy_eda_sorts(legacy_data)),
+        ('EDA sorts (rank index)', lambda: eda_sorts(metrics, ranks)),
+        ('RankIndex build', lambda: RankIndex(metrics)),
+        ('legacy region filter + groupby', lambda: legacy_region_stats(legacy_data)),
+        ('region lookups (RegionStats)', lambda: region_lookups(metrics, regions)),
+        ('RegionStats build', lambda: RegionStats(metrics)),
+        ('legacy tab filters', lambda: legacy_tab_filters(legacy_data, city, compare)),
+        ('tab filters', lambda: tab_filters(metrics, city, compare)),
+    ]
+
+
+def time_call(fn, budget_s: float = 1.0) -> float:
+    """Best-of-3 seconds per call, with the loop count sized to roughly ``budget_s``."""
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    number = max(1, int(budget_s / max(once, 1e-6) / 3))
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number
+
+
+def run(sizes):
+    results = {}
+    for n in sizes:
+        for name, fn in cases(n):
+            seconds = time_call(fn)
+            results.setdefault(name, {})[str(n)] = seconds
+            print(f"{name:<36} {n:>9,} cities  {seconds * 1000:>12.3f} ms", flush=True)
+    return results
+
+
+def save(label, results):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{label}.json")
+    with open(path, 'w') as fh:
+        json.dump({
+            'label': label,
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'dataset': dataset_fingerprint(),
+            'results': results,
+        }, fh, indent=2)
+    return path
+
+
+def compare(old_label, new_label) -> bool:
+    """Print new/old time ratios for every case and size both runs share.
+
+    Returns False, printing nothing else, when the runs were measured on
+    different synthetic data (or one predates the fingerprint).
+    """
+    def load(label):
+        with open(os.path.join(RESULTS_DIR, f"{label}.json")) as fh:
+            return json.load(fh)
+
+    old_run, new_run = load(old_label), load(new_label)
+    if old_run.get('dataset') is None or old_run.get('dataset') != new_run.get('dataset'):
+        print(f"not comparable: {old_label} ran on dataset {old_run.get('dataset')}, "
+              f"{new_label} on {new_run.get('dataset')}; re-record one of them")
+        return False
+    old, new = old_run['results'], new_run['results']
+    print(f"{'case':<36} {'cities':>9} {old_label:>12} {new_label:>12} {'ratio':>7}")
+    for name in old:
+        for size, before in old[name].items():
+            after = new.get(name, {}).get(size)
+            if after is None:
+                continue
+            flag = '  <-- slower' if after > before * 1.2 else ''
+            print(f"{name:<36} {int(size):>9,} {before * 1000:>10.3f}ms {after * 1000:>10.3f}ms {after / before:>6.2f}x{flag}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="comma-separated city counts")
+    parser.add_argument('--label', default=time.strftime('%Y%m%d-%H%M%S'), help="name of the results file")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two stored runs and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(0 if compare(*args.compare) else 1)
+    else:
+        results = run([int(n) for n in args.sizes.split(',')])
+        print(f"saved {save(args.label, results)}")
@@ -0,0 +1,137 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from lazy_imports import lazy_import
+
+
+# Latitude / longitude of every city the dashboards know about
+CITY_COORDS = {
+    "Delhi": [28.7041, 77.1025],
+    "Mumbai": [19.0760, 72.8777],
+    "Bengaluru": [12.9716, 77.5946],
+    "Bangalore": [12.9716, 77.5946],
+    "Chennai": [13.0827, 80.2707],
+    "Hyderabad": [17.3850, 78.4867],
+    "Kolkata": [22.5726, 88.3639],
+    "Pune": [18.5204, 73.8567],
+    "Ahmedabad": [23.0225, 72.5714],
+    "Jaipur": [26.9124, 75.7873],
+    "Lucknow": [26.8467, 80.9462],
+    "Chandigarh": [30.7333, 76.7794],
+    "Bhopal": [23.2599, 77.4126],
+    "Nagpur": [21.1458, 79.0882],
+    "Kochi": [9.9312, 76.2673],
+    "Bhubaneswar": [20.2961, 85.8245],
+    "Guwahati": [26.1445, 91.7362],
+    "Indore": [22.7196, 75.8577],
+    "Patna": [25.5941, 85.1376],
+    "Vadodara": [22.3072, 73.1812],
+    "Surat": [21.1702, 72.8311],
+    "Thane": [19.2183, 72.9781],
+    "Visakhapatnam": [17.6868, 83.2185],
+}
+
+INDIA_CENTER = [22.59, 78.96]
+
+# Region of every city the dashboards know about; cities missing here fall in "Other"
+REGION_MAP = {
+    "North": ["Delhi", "Chandigarh", "Jaipur", "Lucknow"],
+    "South": ["Bengaluru", "Bangalore", "Chennai", "Hyderabad", "Kochi", "Visakhapatnam"],
+    "East": ["Kolkata", "Bhubaneswar", "Guwahati", "Patna"],
+    "West": ["Mumbai", "Pune", "Ahmedabad", "Vadodara", "Surat", "Thane"],
+    "Central": ["Bhopal", "Nagpur", "Indore"],
+}
+REGIONS = list(REGION_MAP) + ["Other"]
+CITY_REGION = {city: region for region, cities in REGION_MAP.items() for city in cities}
+
+
+def region_of(cities) -> pd.Categorical:
+    """Region of each city as a categorical over REGIONS (one small integer code per city)."""
+    return pd.Categorical(pd.Series(cities, dtype=object).map(CITY_REGION).fillna("Other"), categories=REGIONS)
+
+# Popups and rendered map HTML for the current dataset version
+_cache = {"version": None, "popups": {}, "maps": {}}
+_lock = threading.Lock()
+
+
+def popup_table(metrics, cities=None) -> dict:
+    """Popup HTML for every city (or only ``cities``), built once from the metrics table."""
+    frame = metrics.frame(cities)
+    popups = {}
+    for row in frame.to_dict('records'):
+        index = row['Affordability Index']
+        index_text = "n/a" if np.isnan(index) else f"{index:.2f}"
+        popups[row['City']] = (
+            f"<b>{row['City']}</b><br>"
+            f"💰 Salary: ₹{row['Salary']:,.2f}<br>"
+            f"🏠 Rent: ₹{row['Rent']:,.2f}<br>"
+            f"🛒 Groceries: ₹{row['Groceries']:,.2f}<br>"
+            f"🚇 Transport: ₹{row['Transport']:,.2f}<br>"
+            f"📊 Total Cost: ₹{row['Total Cost']:,.2f}<br>"
+            f"⚖️ Affordability Index: {index_text}"
+        )
+    return popups
+
+
+def _render_city(popups, city: str) -> str:
+    folium = lazy_import("folium")
+    lat, lon = CITY_COORDS[city]
+    m = folium.Map(location=[lat, lon], zoom_start=10, tiles="CartoDB positron")
+    folium.Marker(
+        [lat, lon],
+        popup=folium.Popup(popups[city], max_width=250),
+        tooltip=city,
+        icon=folium.Icon(color="blue", icon="info-sign"),
+    ).add_to(m)
+    return m.get_root().render()
+
+
+def _render_all(metrics, popups) -> str:
+    folium = lazy_import("folium")
+    plugins = lazy_import("folium.plugins")
+    m = folium.Map(location=INDIA_CENTER, zoom_start=5, tiles="CartoDB positron")
+    cluster = plugins.MarkerCluster(name="Cities").add_to(m)
+    for city in metrics.city:
+        if city in CITY_COORDS:
+            folium.Marker(
+                CITY_COORDS[city],
+                popup=folium.Popup(popups[city], max_width=250),
+                tooltip=city,
+            ).add_to(cluster)
+    return m.get_root().render()
+
+
+def _refresh(metrics):
+    if _cache["version"] is not None and metrics.parent_version == _cache["version"]:
+        # Patched dataset: re-render only the changed cities' popups and maps (and the all-cities map)
+        popups = {c: p for c, p in _cache["popups"].items() if c not in metrics.changed}
+        popups.update(popup_table(metrics, sorted(metrics.changed)))
+        maps = {key: html for key, html in _cache["maps"].items() if key != "*" and key not in metrics.changed}
+        _cache.update(version=metrics.version, popups=popups, maps=maps)
+    else:
+        _cache.update(version=metrics.version, popups=popup_table(metrics), maps={})
+
+
+def map_html(metrics, city: str = None) -> str:
+    """Standalone HTML of the map for one city, or of all cities (clustered) when ``city`` is None.
+
+    Maps are rendered once per dataset version and shared by every
+    session; the page only embeds the cached HTML. Returns None for a
+    city without known coordinates or without a row in the dataset.
+    """
+    if city is not None and city not in CITY_COORDS:
+        return None
+    key = city or "*"
+    with _lock:
+        if _cache["version"] != metrics.version:
+            _refresh(metrics)
+        if city is not None and city not in _cache["popups"]:
+            return None
+        html = _cache["maps"].get(key)
+        if html is None:
+            popups = _cache["popups"]
+            html = _render_all(metrics, popups) if city is None else _render_city(popups, city)
+            _cache["maps"][key] = html
+    return html
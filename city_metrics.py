@@ -0,0 +1,193 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from city_map import region_of
+from cost_data import DATA_FILE, REQUIRED_COLS, dataset_version, load_price_table, read_delta, write_sidecar
+from perf_trace import stage
+
+
+# Derived per-city metrics, in column order of CityMetrics.values
+METRIC_COLUMNS = ['Salary', 'Rent', 'Milk', 'Bread', 'Rice', 'Transport', 'Groceries', 'Total Cost', 'Affordability Index']
+
+# Set to 1 to keep item prices as float32 (half the memory, ~7 significant digits)
+COMPACT_ENV = "DASHBOARD_COMPACT"
+
+
+def _read_only(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+class CityMetrics:
+    """Array-backed city x metric table shared by every page of the dashboard.
+
+    ``prices`` holds every item column of the CSV as one contiguous matrix
+    (float64, or float32 in compact mode; NaN where a price is missing) and
+    ``values`` holds METRIC_COLUMNS as float64. City names are looked up
+    through ``city_index`` (a pd.Index) rather than a dict per model.
+    ``region`` is each city's region as a categorical (city_map.REGIONS).
+    Both arrays are read-only, so the frames handed out by ``frame`` are
+    views that no page can modify. Affordability Index here is
+    Salary / Total Cost (higher = more affordable), NaN when there is no cost.
+
+    A model built by ``patched`` also records the version it was patched
+    from (``parent_version``), the cities whose rows changed, appeared or
+    disappeared (``changed``) and whether every surviving city kept its
+    row (``same_rows``), so dependent caches can refresh selectively.
+    """
+
+    def __init__(self, city, items, prices, version=None, values=None, dtype=np.float64):
+        self.city = _read_only(np.asarray(city, dtype=object))
+        self.items = list(items)
+        self.prices = _read_only(np.ascontiguousarray(prices, dtype=dtype))
+        self.version = version
+        self._item_pos = {item: j for j, item in enumerate(self.items)}
+        # object dtype: shares the name objects with ``city`` (a str index would copy them)
+        self.city_index = pd.Index(self.city, dtype=object, copy=False)
+        # A repeated name resolves to its last row
+        self._index_rows = None
+        if not self.city_index.is_unique:
+            keep = ~self.city_index.duplicated(keep='last')
+            self.city_index, self._index_rows = self.city_index[keep], np.flatnonzero(keep)
+        self.region = region_of(self.city)
+        self.values = _read_only(self._derive(self.prices) if values is None else values)
+        self._metric_pos = {name: j for j, name in enumerate(METRIC_COLUMNS)}
+        self.parent_version = None
+        self.changed = frozenset()
+        self.same_rows = False
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, version=None, dtype=np.float64) -> "CityMetrics":
+        """Build the model from the loaded dataset (City + parsed item columns)."""
+        for raw_col in REQUIRED_COLS:
+            if raw_col not in data.columns:
+                raise KeyError(f"Missing required column in CSV: {raw_col}")
+        items = [col for col in data.columns if col != 'City' and col not in _DERIVED_FRAME_COLS]
+        prices = data[items].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=dtype)
+        return cls(data['City'].to_numpy(dtype=object), items, prices, version, dtype=dtype)
+
+    def _derive(self, prices: np.ndarray) -> np.ndarray:
+        """METRIC_COLUMNS for the given rows of item prices."""
+        values = np.empty((len(prices), len(METRIC_COLUMNS)), dtype=np.float64)
+        for raw_col, short in REQUIRED_COLS.items():
+            # Same rule as clean_numeric: a missing price counts as 0
+            values[:, METRIC_COLUMNS.index(short)] = np.nan_to_num(prices[:, self._item_pos[raw_col]])
+        col = {name: values[:, j] for j, name in enumerate(METRIC_COLUMNS)}
+        col['Groceries'][:] = col['Milk'] + col['Bread'] + col['Rice']
+        col['Total Cost'][:] = col['Rent'] + col['Groceries'] + col['Transport']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            col['Affordability Index'][:] = np.where(col['Total Cost'] > 0, col['Salary'] / col['Total Cost'], np.nan)
+        return values
+
+    def patched(self, delta) -> "CityMetrics":
+        """New model for a cost_data.RowDelta: only changed and added cities are re-derived."""
+        rows = pd.Index(self.city).get_indexer(delta.city)
+        kept = rows >= 0
+        changed_rows = pd.Index(delta.city).get_indexer(delta.changed['City'])
+        prices = np.empty((len(delta.city), len(self.items)), dtype=self.prices.dtype)
+        prices[kept] = self.prices[rows[kept]]
+        prices[changed_rows] = delta.changed[self.items].to_numpy(dtype=self.prices.dtype)
+        values = np.empty((len(delta.city), len(METRIC_COLUMNS)), dtype=np.float64)
+        values[kept] = self.values[rows[kept]]
+        values[changed_rows] = self._derive(prices[changed_rows])
+
+        model = CityMetrics(delta.city, self.items, prices, delta.digest, values, self.prices.dtype)
+        model.parent_version = self.version
+        model.changed = frozenset(delta.changed['City']) | frozenset(delta.removed)
+        model.same_rows = not delta.removed and bool((rows == np.arange(len(rows))).all())
+        return model
+
+    def __len__(self):
+        return len(self.city)
+
+    # -------------------- Lookups --------------------
+    def metric(self, name: str) -> np.ndarray:
+        """Read-only view of one derived metric across all cities."""
+        return self.values[:, self._metric_pos[name]]
+
+    def price(self, item: str) -> np.ndarray:
+        """Read-only view of one item's price across all cities."""
+        return self.prices[:, self._item_pos[item]]
+
+    def positions(self, cities) -> np.ndarray:
+        """Row positions of the given city names (unknown names are skipped)."""
+        rows = self.city_index.get_indexer(pd.Index(list(cities), dtype=object))
+        rows = rows[rows >= 0]
+        return (rows if self._index_rows is None else self._index_rows[rows]).astype(np.intp, copy=False)
+
+    def frame(self, cities=None) -> pd.DataFrame:
+        """City, Region (categorical) + METRIC_COLUMNS as a DataFrame.
+
+        Without ``cities`` the numbers are a zero-copy view of ``values``;
+        with ``cities`` only the selected rows are gathered.
+        """
+        city, region, values = self.city, self.region, self.values
+        if cities is not None:
+            rows = self.positions(cities)
+            city, region, values = city[rows], region[rows], values[rows]
+        df = pd.DataFrame(values, columns=METRIC_COLUMNS, copy=False)
+        df.insert(0, 'City', city)
+        df.insert(1, 'Region', region)
+        return df
+
+    def price_frame(self, items, cities=None) -> pd.DataFrame:
+        """City + the requested item prices, optionally for a subset of cities."""
+        cols = [self._item_pos[item] for item in items]
+        rows = slice(None) if cities is None else self.positions(cities)
+        df = pd.DataFrame(self.prices[rows][:, cols], columns=list(items))
+        df.insert(0, 'City', self.city[rows])
+        return df
+
+    def table(self, cities=None) -> pd.DataFrame:
+        """City, derived metrics and every item price side by side (for raw-data views)."""
+        metrics = self.frame(cities)
+        prices = self.price_frame(self.items, cities).drop(columns='City')
+        return pd.concat([metrics, prices], axis=1)
+
+
+# Columns load_city_data adds on top of the CSV items
+_DERIVED_FRAME_COLS = set(REQUIRED_COLS.values()) | {'Groceries', 'Total Cost', 'Affordability Index'}
+
+# absolute path -> CityMetrics for the current dataset version
+_models = {}
+_lock = threading.Lock()
+
+
+def load_city_metrics(path: str = DATA_FILE) -> CityMetrics:
+    """Return the shared CityMetrics for the current version of the data file."""
+    # One model per file however it is spelled (the watcher uses absolute paths, pages relative ones)
+    path = os.path.abspath(path)
+    version = dataset_version(path)
+    model = _models.get(path)
+    if model is None or model.version != version:
+        with _lock:
+            model = _models.get(path)
+            if model is None or model.version != version:
+                delta = read_delta(path, model.version) if model is not None else None
+                if delta is not None:
+                    with stage("load: patch city metrics"):
+                        model = model.patched(delta)
+                    _write_sidecar(path, model)
+                else:
+                    # Straight from the parsed price table: no derived DataFrame is kept next to the model
+                    # The version is the hash of the bytes parsed, in case the file changed meanwhile
+                    version, table = load_price_table(path, version)
+                    with stage("load: city metrics"):
+                        model = CityMetrics.from_frame(table, version, _price_dtype())
+                _models[path] = model
+    return model
+
+
+def _price_dtype():
+    return np.float32 if os.environ.get(COMPACT_ENV, "") not in ("", "0") else np.float64
+
+
+def _write_sidecar(path: str, model: CityMetrics):
+    # Keep cold starts fast after a patch; same best-effort rule as cost_data.load_price_table
+    try:
+        write_sidecar(path, model.price_frame(model.items), model.version)
+    except OSError:
+        pass
@@ -0,0 +1,69 @@
+"""Shared fixtures: small synthetic datasets written to a temporary directory.
+
+Synthetic rows come from synth_data (same columns and "1,234.00 ₹"
+formatting as the real CSV). The first cities are renamed to real ones,
+so regions and coordinates have something to work on.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from city_map import CITY_COORDS
+from synth_data import generate_frame
+
+
+N_CITIES = 60
+REAL_CITIES = [city for city in CITY_COORDS if city != "Bangalore"]
+
+
+def write_csv(path, frame: pd.DataFrame) -> str:
+    """Replace ``path`` with ``frame`` in one step (a watcher never sees half a file).
+
+    The mtime always moves, so a rewrite is never mistaken for the old file.
+    """
+    path = str(path)
+    before = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+    frame.to_csv(path + '.tmp', index=False)
+    if before is not None:
+        mtime = max(os.stat(path + '.tmp').st_mtime_ns, before + 1_000_000)
+        os.utime(path + '.tmp', ns=(mtime, mtime))
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def make_raw(n_cities: int = N_CITIES, seed: int = 0, missing_rate: float = 0.05) -> pd.DataFrame:
+    raw = generate_frame(n_cities, seed=seed, missing_rate=missing_rate)
+    k = min(len(REAL_CITIES), n_cities)
+    raw.loc[:k - 1, 'City'] = REAL_CITIES[:k]
+    return raw
+
+
+@pytest.fixture
+def raw() -> pd.DataFrame:
+    return make_raw()
+
+
+@pytest.fixture
+def data_file(tmp_path, raw) -> str:
+    return write_csv(tmp_path / "prices.csv", raw)
+
+
+@pytest.fixture
+def metrics(data_file):
+    from city_metrics import load_city_metrics
+
+    return load_city_metrics(data_file)
+
+
+def edit_prices(raw: pd.DataFrame, rows, seed: int = 1) -> pd.DataFrame:
+    """Copy of ``raw`` with every price of the given rows replaced by a new one."""
+    rng = np.random.default_rng(seed)
+    edited = raw.copy()
+    salary = 'Average Monthly Net Salary (After Tax)'
+    rent = 'Apartment (1 bedroom) in City Centre'
+    for i in rows:
+        edited.loc[i, rent] = f"{rng.uniform(5_000, 90_000):,.2f}\xa0₹"
+        edited.loc[i, salary] = f"{rng.uniform(10_000, 200_000):,.2f}\xa0₹"
+    return edited
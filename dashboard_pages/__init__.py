@@ -0,0 +1,40 @@
+import importlib
+
+import streamlit as st
+
+from city_metrics import load_city_metrics
+from cost_data import DATA_FILE
+from perf_trace import stage
+
+
+# Sidebar label -> page module. Only the selected module is ever imported,
+# so a page's dependencies (and its data) are loaded the first time it is opened.
+PAGES = {
+    "🏠 Home": "home",
+    "ℹ️ About": "about",
+    "🔍 Filter & Insights": "filter_insights",
+    "📊 EDA": "eda",
+    "🌟 Recommendations": "recommendations",
+    "📞 Contact": "contact",
+}
+
+
+def get_metrics():
+    """Shared, cached CityMetrics; stops the page with an error if the data cannot be loaded."""
+    try:
+        with stage("load: metrics"):
+            return load_city_metrics(DATA_FILE)
+    except FileNotFoundError:
+        st.error(f"Data file not found. Please ensure '{DATA_FILE}' is present in the working directory.")
+        st.stop()
+    except KeyError as e:
+        st.error(e.args[0])
+        st.stop()
+
+
+def render(label: str):
+    """Import (first time only) and run the page registered under ``label``."""
+    with stage(f"page: {label}"):
+        with stage("page import"):
+            page = importlib.import_module(f"{__name__}.{PAGES[label]}")
+        page.render()
@@ -0,0 +1,57 @@
+import streamlit as st
+
+
+def render():
+    st.title("ℹ️ About This Dashboard")
+    st.markdown("""
+### 🎯 **Project Objective**
+The **Smart City Cost and Affordability Dashboard** is designed to analyze and visualize 
+the **cost of living across major Indian cities**.  
+It helps users, students, and professionals identify **the most affordable and balanced cities** 
+by comparing key parameters like rent, groceries, transportation, and salary.
+
+---
+
+### 🧠 **Key Features**
+- 💰 **Affordability Analysis:** Calculates an affordability score using salary-to-expense ratio.  
+- 📊 **Interactive Visualizations:** Explore city-wise comparisons using dynamic charts and maps.  
+- 🌍 **Geographical Mapping:** View the top cities plotted on a real-time map using Folium.  
+- 🤖 **Smart Recommendations:** Suggests cities that offer the best living value for your budget.  
+- 📈 **Custom Analysis Tools:** Adjust budgets, compare spending patterns, and download reports.
+
+---
+
+### 🧮 **Data Description**
+The dataset includes:
+- **Average monthly salaries (after tax)**  
+- **Rent of 1BHK apartments in city centres**  
+- **Monthly transport pass prices**  
+- **Groceries such as milk and rice**  
+- **Derived affordability metrics**
+
+All data has been **cleaned, standardized, and analyzed** to ensure reliability and comparability across cities.
+
+---
+
+### 🧰 **Technology Stack**
+- 🐍 **Python**  
+- 📊 **Pandas, NumPy** — data cleaning and computation  
+- 📈 **Plotly, Matplotlib, Seaborn** — visualization  
+- 🌐 **Streamlit** — interactive web interface  
+- 🗺️ **Folium** — geographical mapping  
+
+---
+
+### 👩‍💻 **Team & Credits**
+Developed as part of a **Data Analytics / Software Engineering project**  
+by **[Your Name / Team Name]**, under the guidance of **[Mentor/Instructor Name]**.  
+This project demonstrates how **data-driven decision-making** can help individuals 
+choose better cities for living and working in India.
+
+---
+
+### 💡 **Future Enhancements**
+- Integration with **real-time APIs** for updated cost-of-living data  
+- Addition of **weather and safety indices**  
+- Machine learning–based **predictive affordability modeling**
+""")
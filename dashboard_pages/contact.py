@@ -0,0 +1,23 @@
+import streamlit as st
+
+
+def render():
+    st.title("📞 Contact & Feedback")
+
+    st.markdown("""
+Thank you for exploring the **Smart City Cost and Affordability Dashboard**! 🌆  
+We’d love to hear your thoughts, suggestions, or collaboration ideas.
+
+---
+
+### ✉️ **Get in Touch**
+                
+-📍 **Location:** India 
+-📧 **Email:** [inderpreet.kaur0605@gmail.com](mailto:inderpreet.kaur0605@gmail.com)  
+-💼 **LinkedIn:** [LinkedIn](https://www.linkedin.com/in/inderpreet-kaur-59b4632b9?utm_source=share&utm_campaign=share_via&utm_content=profile&utm_medium=android_app)               
+-🌐 **Portfolio / GitHub:** [https://github.com/Inderpreetkaur260](https://github.com/Inderpreetkaur260)  
+
+---
+
+
+""")
@@ -0,0 +1,136 @@
+import pandas as pd
+import streamlit as st
+
+from dashboard_pages import get_metrics
+from data_grid import render_grid, share_source
+from eda_cache import heatmap_figure, ols, residual_table, salary_cost_figure
+from lazy_imports import lazy_import
+from perf_trace import chart
+from rank_index import load_rank_index, ranked_frame
+
+# Plotting stack is imported when this page is first opened, not at app start
+px = lazy_import("plotly.express", page="EDA")
+
+
+def render():
+    metrics = get_metrics()
+    data = metrics.frame()
+    # Sort orders are precomputed once per dataset version; the charts below only slice them
+    ranks = load_rank_index(metrics)
+
+    st.title("📊 Exploratory Data Analysis (EDA)")
+
+    st.subheader("1️. Summary Statistics")
+
+# --- Calculate statistics manually using formulas ---
+    mean_salary = data['Salary'].mean()
+    median_salary = data['Salary'].median()
+    mean_rent = data['Rent'].mean()
+    median_rent = data['Rent'].median()
+    mean_groceries = data['Groceries'].mean()
+    mean_transport = data['Transport'].mean()
+    mean_total_cost = data['Total Cost'].mean()
+    median_total_cost = data['Total Cost'].median()
+    mean_affordability = data['Affordability Index'].mean()
+    std_affordability = data['Affordability Index'].std()
+
+# --- Prepare clean summary table ---
+    summary_stats = pd.DataFrame({
+        "Metric": [
+        "Average Salary (₹)",
+        "Median Salary (₹)",
+        "Average Rent (₹)",
+        "Median Rent (₹)",
+        "Average Groceries (₹)",
+        "Average Transport (₹)",
+        "Average Total Cost (₹)",
+        "Median Total Cost (₹)",
+        "Mean Affordability Index",
+        "Std Dev of Affordability Index"
+    ],
+    "Value": [
+        round(mean_salary, 2),
+        round(median_salary, 2),
+        round(mean_rent, 2),
+        round(median_rent, 2),
+        round(mean_groceries, 2),
+        round(mean_transport, 2),
+        round(mean_total_cost, 2),
+        round(median_total_cost, 2),
+        round(mean_affordability, 3),
+        round(std_affordability, 3)
+    ]
+})
+
+    st.dataframe(summary_stats, use_container_width=True)
+
+
+    st.subheader("2. Correlation Heatmap")
+    # Correlation matrix and figure are built once per dataset version and shared by every session
+    if len(data):
+        chart(st.plotly_chart, heatmap_figure(metrics), use_container_width=True, name="EDA correlation heatmap")
+    else:
+        st.info("No numeric columns found for correlation analysis.")
+
+    st.subheader("3. City-wise Distribution of Average Salary")
+    fig_salary = px.box(data, x='City', y='Salary', points="all", title="Salary Distribution Across Cities")
+    chart(st.plotly_chart, fig_salary, use_container_width=True, name="EDA salary box")
+
+    st.subheader("4. Top 10 Expensive Cities by Rent")
+    top_rent = ranked_frame(metrics, ranks.top('Rent', 10))
+    fig_rent = px.bar(top_rent, x='City', y='Rent', title="Top 10 Cities by Rent (City Centre)", color='Rent')
+    chart(st.plotly_chart, fig_rent, name="EDA top rent")
+
+    st.subheader("5. Affordability Index by City")
+    fig_afford = px.bar(
+        ranked_frame(metrics, ranks.sorted_rows('Affordability Index', descending=True)),
+        x='City', y='Affordability Index',
+        color='Affordability Index',
+        title="Affordability Index (Higher = More Affordable)"
+    )
+    chart(st.plotly_chart, fig_afford, use_container_width=True, name="EDA affordability")
+
+    st.subheader("6. Spending Distribution Table")
+    cost_columns = ['Apartment (1 bedroom) in City Centre', 'Monthly Pass (Regular Price)',
+                'Milk (regular), (1 liter)', 'Loaf of Fresh White Bread (500g)', 'Rice (white), (1kg)']
+    # Percentage of total cost per city, computed and colour-bucketed once per dataset version;
+    # only the visible page is styled and sent
+    render_grid(share_source(metrics, cost_columns), key="spending_grid", gradient=True)
+
+    st.subheader("7. Salary vs Total Cost Relationship")
+
+    # One OLS fit across all cities, cached per dataset version (no statsmodels refit per rerun)
+    fit = ols(metrics)
+    chart(st.plotly_chart, salary_cost_figure(metrics), use_container_width=True, name="EDA salary vs cost")
+    st.caption(f"Total Cost ≈ {fit.slope:.3f} × Salary + {fit.intercept:,.0f} (R² = {fit.r2:.2f})")
+    with st.expander("Cities furthest from the trend"):
+        st.dataframe(residual_table(metrics, fit), hide_index=True)
+
+    st.subheader("8. Cost Components Trend Across Cities")
+
+# Sort cities alphabetically for better visualization
+    data_sorted = data.take(ranks.city_order)
+
+# Prepare a long-format dataframe for plotting multiple cost lines
+    cost_trend_df = pd.melt(
+        data_sorted,
+        id_vars=['City'],
+        value_vars=['Rent', 'Groceries', 'Transport'],
+        var_name='Category',
+        value_name='Cost'
+    )
+
+    fig_cost_trend = px.line(
+        cost_trend_df,
+        x='City', y='Cost',
+        color='Category',
+        markers=True,
+        title="Trend of Major Monthly Expenses Across Cities"
+    )
+
+    fig_cost_trend.update_layout(
+        xaxis_title="City",
+        yaxis_title="Cost (₹)",
+       legend_title="Expense Category"
+    )
+    chart(st.plotly_chart, fig_cost_trend, use_container_width=True, name="EDA cost trend")
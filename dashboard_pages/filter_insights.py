@@ -0,0 +1,250 @@
+import pandas as pd
+import streamlit as st
+
+from basket import session_basket
+from city_map import map_html
+from city_metrics import METRIC_COLUMNS
+from cost_data import DATA_FILE
+from dashboard_pages import get_metrics
+from data_grid import metrics_source, render_grid
+from geo_index import load_geo_index, most_affordable_within
+from lazy_imports import lazy_import
+from lazy_tabs import lazy_tabs, tab_cache
+from perf_trace import chart, stage
+from rank_index import load_rank_index
+from regions import load_region_stats
+from scenarios import evaluate_scenarios, scenario_template
+from snapshots import load_store
+from upload_pipeline import render_upload
+
+px = lazy_import("plotly.express", page="Filter & Insights")
+
+# Starting basket for the Cost Calculator (the old milk / bread / rice trio)
+DEFAULT_BASKET = {
+    'Milk (regular), (1 liter)': 1.0,
+    'Loaf of Fresh White Bread (500g)': 1.0,
+    'Rice (white), (1kg)': 1.0,
+}
+
+
+def render():
+    metrics = get_metrics()
+    data = metrics.frame()
+
+    st.title("🔍 Filter & Insights")
+    st.markdown("""
+    Use filters on the sidebar to slice the data and dive deeper 🔬
+    """)
+
+    st.sidebar.header("🎛️ Filters")
+    # Regions come from city_map.REGION_MAP; their city lists and aggregates are cached per version
+    regions = load_region_stats(metrics)
+
+    region_selected = st.sidebar.selectbox("🌍 Select Region", ["All"] + regions.present())
+    if region_selected != "All":
+        cities = regions.cities_in(region_selected)
+    else:
+        cities = data["City"].unique()
+
+    selected_city = st.sidebar.selectbox("🏙️ Select a City", cities)
+    min_salary = st.sidebar.slider("💵 Minimum Avg Salary (₹)", 10000, 100000, 20000)
+    max_aff_index = st.sidebar.slider("📊 Max Affordability Index", 0.1, 5.0, 1.0)
+    normalize = st.sidebar.checkbox("📉 Show Normalized (% of Salary) Costs")
+    
+    st.success(f"You're exploring data for {selected_city} in the {region_selected} region.")
+
+    filtered_df = metrics.frame([selected_city])
+
+    tab_labels = [
+        "🏙️ City Overview",
+        "📊 Compare Cities",
+        "🧲 Budget Planner",
+        "🗺️ Map View",
+        "🧮 Cost Calculator",
+        "🗃️ Raw Data Explorer",
+        "📤 Upload Your Data",
+        "📊 Dataset Overview"
+    ]
+    # Only the selected tab's body runs on a rerun
+    active_tab = lazy_tabs(tab_labels, key="filter_tab")
+
+    with stage(f"tab: {active_tab}"):
+        if active_tab == tab_labels[0]:
+            st.markdown(
+                f"""
+                <div style="
+                    background-color:#f9fafb;
+                    border-radius:16px;
+                    padding:20px;
+                    box-shadow:0 4px 12px rgba(0,0,0,0.1);
+                    margin-bottom:15px;
+                    width: 60%;
+                ">
+                    <h3 style="margin:0; color:#2d3748;">💸 Cost Breakdown for {selected_city}</h3>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            if filtered_df.empty:
+                st.warning("No data available for the selected filters.")
+            else:
+                row = filtered_df.iloc[0]  # just the first row (assuming one city is selected)
+            st.markdown(
+                f"""
+                <div style="
+                    background-color:white;
+                    border-radius:12px;
+                    padding:16px 20px;
+                    margin:8px 0;
+                    box-shadow:0 2px 8px rgba(0,0,0,0.12);
+                    width: 60%;
+                ">
+                    <h4 style="margin-top:0; margin-bottom:10px; color:#2b6cb0;">{row['City']}</h4>
+                    <table style="width:100%; font-size:14px; color:#4a5568;">
+                        <tr><td><b>Salary</b></td><td>{row['Salary']}</td></tr>
+                        <tr><td><b>Rent</b></td><td>{row['Rent']}</td></tr>
+                        <tr><td><b>Groceries</b></td><td>{row['Groceries']}</td></tr>
+                        <tr><td><b>Transport</b></td><td>{row['Transport']}</td></tr>
+                        <tr><td><b>Total Cost</b></td><td>{row['Total Cost']}</td></tr>
+                        <tr><td><b>Affordability Index</b></td><td>{row['Affordability Index']}</td></tr>
+                    </table>
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
+
+            if not filtered_df.empty:
+                with st.expander(f"🏅 Where {selected_city} ranks"):
+                    st.caption("Rank 1 = cheapest / lowest; percentile = share of cities at or below this value.")
+                    st.dataframe(load_rank_index(metrics).city_ranks(selected_city), hide_index=True)
+
+            with st.expander("🌍 How the regions compare"):
+                r1, r2 = st.columns(2)
+                region_col = r1.selectbox("Column", regions.columns, index=regions.columns.index('Total Cost'),
+                                          key="region_column")
+                region_stat = r2.selectbox("Statistic", ['median', 'mean', 'min', 'max'], key="region_stat")
+                st.dataframe(regions.rank_regions(region_col, region_stat), hide_index=True)
+                if region_selected != "All":
+                    st.markdown(f"**{region_selected} at a glance**")
+                    st.dataframe(regions.summary(region_selected, METRIC_COLUMNS).round(2), hide_index=True)
+
+            # Every loaded version of the data is kept on disk (see snapshots.py)
+            history = load_store(DATA_FILE)
+            if len(history) >= 2:
+                with st.expander(f"📈 Price history ({len(history)} snapshots)"):
+                    items = metrics.items
+                    default_item = items.index('Apartment (1 bedroom) in City Centre') if 'Apartment (1 bedroom) in City Centre' in items else 0
+                    item = st.selectbox("Item", items, index=default_item, key="history_item")
+                    trend = history.trend(selected_city, item, last=24)
+                    fig_trend = px.line(trend.rename_axis('Snapshot').reset_index(), x='Snapshot', y=item, markers=True,
+                                        title=f"{item} in {selected_city}")
+                    chart(st.plotly_chart, fig_trend, name="Price history")
+                    st.markdown("**Largest price rises since the first snapshot**")
+                    st.dataframe(tab_cache(metrics, ("inflation", history.snapshots[-1]['version'], len(history)),
+                                           lambda: history.inflation(k=10)), hide_index=True)
+
+        if active_tab == tab_labels[1]:
+            st.subheader("📊 Compare Cities")
+            compare_cities = st.multiselect("Select cities to compare", options=data["City"].unique(), default=[selected_city])
+            compare_df = metrics.frame(compare_cities)
+
+            fig_compare, fig_scatter = tab_cache(metrics, ("compare", tuple(compare_cities)), lambda: (
+                px.bar(compare_df, x='City', y='Total Cost', color='City', title="Total Monthly Cost by City"),
+                px.scatter(compare_df, x='Salary', y='Total Cost', color='City', size='Affordability Index',
+                           title="Affordability: Salary vs Total Cost"),
+            ))
+            chart(st.plotly_chart, fig_compare, name="Compare total cost")
+            chart(st.plotly_chart, fig_scatter, name="Compare salary vs cost")
+
+
+        if active_tab == tab_labels[2]:
+            st.subheader("🧲 Budget Planner")
+            budget = st.slider("Monthly Budget (₹)", 5000, 200000, 30000, step=1000)
+            if filtered_df.empty:
+                st.info("Select a valid city to evaluate budget fit.")
+            else:
+                total_cost = float(filtered_df['Total Cost'].iloc[0])
+                if total_cost <= budget:
+                    st.success(f"✅ {selected_city} fits your budget! (Estimated total: ₹{total_cost:,.0f})")
+                else:
+                    st.warning(f"❌ {selected_city} exceeds your budget. (Estimated total: ₹{total_cost:,.0f})")
+
+            with st.expander("📑 Evaluate many household profiles at once"):
+                st.caption("Upload a CSV with a Budget column, an optional Scenario name and one column per item with its monthly quantity.")
+                st.download_button("Download template", scenario_template(metrics).to_csv(index=False), "scenarios_template.csv")
+                scenario_file = st.file_uploader("Scenarios CSV", type="csv", key="scenario_file")
+                if scenario_file is not None:
+                    try:
+                        result = evaluate_scenarios(metrics, pd.read_csv(scenario_file))
+                    except KeyError as e:
+                        st.error(e.args[0])
+                    except (pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError, ValueError) as e:
+                        st.error(f"Could not read the scenarios CSV: {e}")
+                    else:
+                        st.write(f"Cities that fit each profile ({result.fit.values.sum():,} of {result.fit.size:,} combinations):")
+                        st.dataframe(result.fit)
+                        st.download_button("Download surplus matrix", result.surplus.to_csv(), "scenario_surplus.csv")
+
+        if active_tab == tab_labels[3]:
+            st.subheader("🗺️ Map View")
+            map_scope = st.radio("Show", [selected_city, "All cities"], horizontal=True, key="map_scope")
+
+            # Pre-rendered once per dataset version and shared by every session; our own HTML, so a scripted iframe is fine
+            html = map_html(metrics, None if map_scope == "All cities" else selected_city)
+            if html is not None:
+                chart(st.iframe, html, width=725, height=500, name="Map")
+            else:
+                st.info("Coordinates not available for this city.")
+
+            st.markdown("#### 📍 Most affordable cities nearby")
+            radius_km = st.slider("Radius (km)", 50, 1500, 300, step=50)
+            try:
+                nearby = most_affordable_within(metrics, load_geo_index(metrics), selected_city, radius_km, k=5)
+            except KeyError:
+                st.info("Coordinates not available for this city.")
+            else:
+                st.dataframe(nearby[['City', 'Distance (km)', 'Total Cost', 'Affordability Index']], hide_index=True)
+
+        if active_tab == tab_labels[4]:
+            st.subheader("🧮 Cost Calculator")
+            st.caption("Set a monthly quantity for any item; only the items you change are re-priced.")
+            basket = session_basket(st.session_state, metrics, DEFAULT_BASKET)
+            # Seeded from the session's basket: the editor's own state is dropped while another tab is active
+            current = basket.quantity_frame()
+            edited = st.data_editor(
+                current,
+                key="basket_editor",
+                disabled=["Item"],
+                hide_index=True,
+                column_config={"Quantity": st.column_config.NumberColumn(min_value=0.0, step=0.5)},
+            )
+            quantities = edited['Quantity'].fillna(0).to_numpy(dtype=float)
+            changed = quantities != current['Quantity'].to_numpy()
+            basket.update(dict(zip(edited['Item'][changed], quantities[changed])))
+
+            if filtered_df.empty:
+                st.info("Select a valid city to price your basket.")
+            else:
+                st.write(f"Estimated Basket Cost in {selected_city}: ₹{basket.total(selected_city):,.2f}")
+                st.dataframe(basket.breakdown(selected_city), hide_index=True)
+            st.markdown("**Cities ranked by the cost of this basket**")
+            st.dataframe(basket.ranking(), hide_index=True)
+
+        if active_tab == tab_labels[5]:
+            st.subheader("🗃️ Raw Data Explorer")
+            only_selected = st.checkbox(f"Only {selected_city}", value=True, key="raw_only_selected")
+            render_grid(metrics_source(metrics), key="raw_grid", default_columns=metrics.items,
+                        cities=[selected_city] if only_selected else None)
+
+        if active_tab == tab_labels[6]:
+            st.subheader("📤 Upload Your Data")
+            uploaded_file = st.file_uploader("Upload a CSV file")
+            if uploaded_file:
+                # Preview now; row count and column types of the whole file from a background parse, cached by content hash
+                render_upload(uploaded_file)
+
+        if active_tab == tab_labels[7]:
+            st.subheader("Dataset Overview")
+            # One page of the projected columns per rerun instead of the whole table
+            render_grid(metrics_source(metrics), key="overview_grid", default_columns=METRIC_COLUMNS)
@@ -0,0 +1,33 @@
+import streamlit as st
+
+
+def render():
+    st.title("🌍 Global Cost of Living Explorer in India")
+    st.markdown("""
+Welcome to the **Smart City Cost and Affordability Dashboard** — an interactive platform that helps users 
+**analyze and compare the cost of living across major Indian cities**.
+
+💡 This dashboard provides insights into:
+- 🏠 **Housing and rent prices**
+- 🚗 **Transportation costs**
+- 🛒 **Daily essentials and groceries**
+- 💰 **Average salaries and affordability scores**
+- 🌟 **AI-based city recommendations**
+                
+ Navigate the vibrant economics of Indian cities in one powerful dashboard 🚀
+
+    **This tool allows you to:**
+    - 🔎 Compare city-wise rent, groceries, transport, and salaries
+    - 💰 Plan your relocation smartly with budget calculators
+    - 🌐 Upload your own data to explore more
+
+    **Made for dreamers, doers, and data lovers 💡**
+
+Use the sidebar to explore:
+- 📊 *Data Insights* — explore visual trends and comparisons  
+- 💡 *Smart Recommendations* — find cities offering the best value for your budget  
+- 📈 *EDA Section* — analyze the relationship between cost, salary, and lifestyle  
+
+This project combines **data visualization**, **affordability modeling**, and **decision support** to guide
+users in choosing cities that balance comfort and cost effectively.
+""")
@@ -0,0 +1,84 @@
+import streamlit as st
+
+from dashboard_pages import get_metrics
+from lazy_imports import lazy_import
+from perf_trace import chart
+from recommend import DEFAULT_WEIGHTS, recommend
+
+px = lazy_import("plotly.express", page="Recommendations")
+
+
+def render():
+    metrics = get_metrics()
+    data = metrics.frame()
+
+    st.title("🌟 Smart City Recommendations")
+    st.markdown("""
+    Here are the top cities based on your salary-to-cost ratio 🔍💡
+    """)
+
+    # --- User-tunable score: any items, any weights, optional budget ---
+    with st.expander("⚙️ Customise the score"):
+        chosen_items = st.multiselect("Items in your monthly basket", metrics.items, default=list(DEFAULT_WEIGHTS))
+        weights = {
+            item: st.number_input(f"Monthly quantity: {item}", 0.0, 100.0, DEFAULT_WEIGHTS.get(item, 1.0), key=f"weight_{item}")
+            for item in chosen_items
+        }
+        budget = st.number_input("Monthly budget for the basket (₹, 0 = no limit)", 0, 1_000_000, 0, step=1000)
+
+    # --- Compute Top Cities by Affordability Score ---
+    top_cities = recommend(metrics, weights, budget, k=5)
+    if top_cities.empty:
+        st.warning("No city fits this basket within your budget.")
+    else:
+        st.subheader("📘 Recommendation Summary")
+
+        avg_salary = data['Salary'].mean()
+        avg_rent = data['Rent'].mean()
+        avg_afford = data['Affordability Index'].mean()
+
+        st.markdown(f"""
+        The recommendations are based on the **Affordability Score** = Salary / (cost of your monthly basket).
+        By default the basket is Rent + Transport + Basic Groceries (milk and rice).
+
+        **National Averages:**
+        - 💰 Average Salary: ₹{avg_salary:,.0f}  
+        - 🏠 Average Rent: ₹{avg_rent:,.0f}  
+        - ⚖️ Average Affordability Index: {avg_afford:.2f}
+
+        Cities scoring higher than these are considered **better value-for-money**.
+        """)
+
+        # --- Bar Chart ---
+        fig_top = px.bar(
+            top_cities,
+            x='City',
+            y='Affordability Score',
+            color='Affordability Score',
+            text='Affordability Score',
+            title="Top 5 Cities with Best Affordability",
+            color_continuous_scale="viridis"
+        )
+        fig_top.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+        chart(st.plotly_chart, fig_top, use_container_width=True, name="Top 5 affordability")
+
+        # --- Best City Card ---
+        st.subheader("🏆 Best City Overall")
+
+        best_city = top_cities.iloc[0]
+        st.markdown(f"""
+        <div style="
+            background-color:#f8fafc;
+            padding:20px;
+            border-radius:12px;
+            box-shadow:0 2px 8px rgba(0,0,0,0.1);
+            width:60%;
+        ">
+        <h3 style="color:#2b6cb0;">🌆 {best_city['City']}</h3>
+        <p><b>Affordability Score:</b> {best_city['Affordability Score']:.2f}</p>
+        <p><b>Salary:</b> ₹{best_city['Salary']:,.2f}</p>
+        <p><b>Rent:</b> ₹{best_city['Rent']:,.2f}</p>
+        <p><b>Transport:</b> ₹{best_city['Transport']:,.2f}</p>
+        <p><b>Milk:</b> ₹{best_city['Milk']:,.2f} | <b>Rice:</b> ₹{best_city['Rice']:,.2f}</p>
+        </div>
+        """, unsafe_allow_html=True)
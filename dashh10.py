@@ -5,15 +5,13 @@ import pandas as pd
 import plotly.express as px
 import numpy as np
 
+from cost_data import DATA_FILE, clean_numeric, load_city_data
+from upload_pipeline import render_upload
+
 # Page config MUST be at the top before any Streamlit output
 st.set_page_config(page_title="Global Cost of Living Explorer in India", layout="wide")
 
 # -------------------- Helpers --------------------
-def clean_numeric(series: pd.Series) -> pd.Series:
-    """Convert strings with symbols to numeric, coerce errors to 0."""
-    return pd.to_numeric(series.replace('[^0-9.]', '', regex=True), errors='coerce').fillna(0)
-
-
 def recommend_city(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
     salary = clean_numeric(df['Average Monthly Net Salary (After Tax)'])
@@ -30,34 +28,15 @@ def recommend_city(df: pd.DataFrame) -> pd.DataFrame:
     return df.sort_values(by='Affordability Score', ascending=False).head(5)
 
 # -------------------- Load Data --------------------
+# Parsed, cleaned and derived once per file version, shared across sessions
 try:
-    data = pd.read_csv("cost_of_living_indian_cities.csv")
+    data = load_city_data(DATA_FILE)
 except FileNotFoundError:
-    st.error("Data file not found. Please ensure 'cost_of_living_indian_cities.csv' is present in the working directory.")
+    st.error(f"Data file not found. Please ensure '{DATA_FILE}' is present in the working directory.")
+    st.stop()
+except KeyError as e:
+    st.error(e.args[0])
     st.stop()
-
-# -------------------- Clean numeric columns once --------------------
-# Guard missing columns with get and defaults
-required_cols = {
-    'Average Monthly Net Salary (After Tax)': 'Salary',
-    'Apartment (1 bedroom) in City Centre': 'Rent',
-    'Milk (regular), (1 liter)': 'Milk',
-    'Loaf of Fresh White Bread (500g)': 'Bread',
-    'Rice (white), (1kg)': 'Rice',
-    'Monthly Pass (Regular Price)': 'Transport',
-}
-
-for raw_col, clean_col in required_cols.items():
-    if raw_col not in data.columns:
-        st.error(f"Missing required column in CSV: {raw_col}")
-        st.stop()
-    data[clean_col] = clean_numeric(data[raw_col])
-
-# Derived columns
-data['Groceries'] = data['Milk'] + data['Bread'] + data['Rice']
-data['Total Cost'] = data['Rent'] + data['Groceries'] + data['Transport']
-with np.errstate(divide='ignore', invalid='ignore'):
-    data['Affordability Index'] = (data['Total Cost'] / data['Salary']).replace([np.inf, -np.inf], 0).fillna(0)
 
 # -------------------- Sidebar Navigation --------------------
 pages = ["🏠 Home", "ℹ️ About", "🔍 Filter & Insights", "📊 EDA", "🌟 Recommendations"]
@@ -256,12 +235,8 @@ elif selected_page == "🔍 Filter & Insights":
         st.subheader("Upload Your Data")
         file = st.file_uploader("Upload CSV")
         if file is not None:
-            try:
-                df_up = pd.read_csv(file)
-                st.success("File loaded successfully. Preview below:")
-                st.dataframe(df_up.head())
-            except Exception as e:
-                st.error(f"Failed to read CSV: {e}")
+            # Preview now, full parse in the background, cached by content hash
+            render_upload(file)
 
 # -------------------- EDA --------------------
 elif selected_page == "📊 EDA":
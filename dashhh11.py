@@ -9,12 +9,11 @@ from streamlit_folium import st_folium
 import io
 import numpy as np
 
+from cost_data import DATA_FILE, clean_numeric, load_city_data
+
 
 # -------------------- Helpers --------------------
 st.set_page_config(page_title="Global Cost of Living Explorer in India", layout="wide")
-def clean_numeric(series):
-    return pd.to_numeric(series.replace('[^0-9.]', '', regex=True), errors='coerce').fillna(0)
-
 def recommend_city(df):
     df = df.copy()
     df['Affordability Score'] = clean_numeric(df['Average Monthly Net Salary (After Tax)']) / (
@@ -28,9 +27,12 @@ def recommend_city(df):
 
 # -------------------- Load Data --------------------
 try:
-    data = pd.read_csv("cost_of_living_indian_cities.csv")
+    data = load_city_data(DATA_FILE)
 except FileNotFoundError:
-    st.error("Data file not found. Please ensure 'cost_of_living_indian_cities.csv' is present in the working directory.")
+    st.error(f"Data file not found. Please ensure '{DATA_FILE}' is present in the working directory.")
+    st.stop()
+except KeyError as e:
+    st.error(e.args[0])
     st.stop()
 
 
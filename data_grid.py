@@ -0,0 +1,189 @@
+"""Server-side paginated grid over the cached city tables.
+
+Sorting, filtering and column projection run against column arrays that
+are built once per dataset version (GridSource); only the visible page
+of the projected columns is turned into a DataFrame and sent to the
+browser. Sort orders come from the RankIndex when it has the column, so
+a sort is a gather, not a sort. Gradient colours (the old
+``style.background_gradient``) are bucketed once per column and only the
+visible cells are styled.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from city_metrics import METRIC_COLUMNS
+from rank_index import load_rank_index
+
+
+PAGE_SIZE = 50
+# ColorBrewer "Blues", light to dark (what background_gradient(cmap='Blues') ranges over)
+BLUES = ['#f7fbff', '#deebf7', '#c6dbef', '#9ecae1', '#6baed6', '#4292c6', '#2171b5', '#08519c', '#08306b']
+_CSS = [f"background-color: {c}; color: {'#f1f1f1' if k >= 5 else '#000000'}" for k, c in enumerate(BLUES)]
+
+
+class GridSource:
+    """City column + named float columns for a grid, with lazily cached sort orders and colour buckets."""
+
+    def __init__(self, city, columns: dict, ranks=None):
+        self.city = np.asarray(city, dtype=object)
+        self.columns = columns
+        self.ranks = ranks
+        self._orders = {}
+        self._buckets = {}
+        self._city_lower = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.city)
+
+    def names(self) -> list:
+        return ['City'] + list(self.columns)
+
+    def sorted_rows(self, column: str, descending: bool = False) -> np.ndarray:
+        """Row order for one column (missing values last); computed at most once per column and direction."""
+        if self.ranks is not None and column in self.ranks.columns:
+            return self.ranks.sorted_rows(column, descending)
+        if column == 'City' and self.ranks is not None:
+            order = self.ranks.city_order
+            return order[::-1] if descending else order
+        key = (column, descending)
+        with self._lock:
+            if key not in self._orders:
+                values = self.city.astype(str) if column == 'City' else self.columns[column]
+                order = np.argsort(values, kind='stable')
+                if descending:
+                    present = order[:np.count_nonzero(~pd.isna(values))]
+                    order = np.concatenate([present[::-1], order[len(present):]])
+                self._orders[key] = order
+            return self._orders[key]
+
+    def buckets(self, column: str) -> np.ndarray:
+        """Per-cell index into BLUES from the column's min-max range (-1 where missing)."""
+        with self._lock:
+            if column not in self._buckets:
+                values = self.columns[column]
+                lo, hi = np.nanmin(values), np.nanmax(values)
+                scaled = (values - lo) / (hi - lo) if hi > lo else np.zeros_like(values)
+                # Missing cells are bucketed as 0 here (casting NaN warns) and marked -1 below
+                buckets = np.clip(np.nan_to_num(scaled * len(BLUES)).astype(np.int64), 0, len(BLUES) - 1)
+                buckets[np.isnan(values)] = -1
+                self._buckets[column] = buckets
+            return self._buckets[column]
+
+    def city_mask(self, search: str) -> np.ndarray:
+        with self._lock:
+            if self._city_lower is None:
+                self._city_lower = pd.Series(self.city.astype(str)).str.lower()
+        return self._city_lower.str.contains(search.lower(), regex=False).to_numpy()
+
+    def rows(self, sort: str = None, descending: bool = False, search: str = None, cities=None,
+             value_range=None) -> np.ndarray:
+        """Positions of the matching rows, in display order.
+
+        ``value_range`` is ``(column, low, high)``; ``cities`` keeps only those
+        names. Filters are boolean masks over the cached arrays and the sort
+        order is a stored permutation, so nothing is copied or sorted here.
+        """
+        mask = np.ones(len(self.city), dtype=bool)
+        if search:
+            mask &= self.city_mask(search)
+        if cities is not None:
+            mask &= np.isin(self.city, list(cities))
+        if value_range is not None:
+            col, low, high = value_range
+            with np.errstate(invalid='ignore'):
+                mask &= (self.columns[col] >= low) & (self.columns[col] <= high)
+        rows = self.sorted_rows(sort, descending) if sort else np.arange(len(self.city))
+        return rows[mask[rows]]
+
+    def window(self, rows: np.ndarray, columns=None, page: int = 0, page_size: int = PAGE_SIZE):
+        """(DataFrame of one page of ``rows`` and the projected columns, the row positions shown)."""
+        columns = [col for col in (columns or list(self.columns)) if col in self.columns]
+        visible = rows[page * page_size:(page + 1) * page_size]
+        df = pd.DataFrame({col: self.columns[col][visible] for col in columns})
+        df.insert(0, 'City', self.city[visible])
+        return df, visible
+
+    def styled(self, df: pd.DataFrame, visible: np.ndarray, columns):
+        """Styler colouring only the visible cells from the precomputed buckets."""
+        css = pd.DataFrame('', index=df.index, columns=df.columns)
+        for col in columns:
+            if col in self.columns:
+                b = self.buckets(col)[visible]
+                css[col] = np.where(b >= 0, np.asarray(_CSS, dtype=object)[b], '')
+        return df.style.apply(lambda _: css, axis=None).format(precision=2)
+
+
+# -------------------- Sources per dataset version --------------------
+_sources = {}
+_lock = threading.Lock()
+
+
+def _cached_source(metrics, name, build) -> GridSource:
+    key = (metrics.version, name)
+    source = _sources.get(key)
+    if source is None:
+        with _lock:
+            source = _sources.get(key)
+            if source is None:
+                for stale in [k for k in _sources if k[0] != metrics.version]:
+                    del _sources[stale]
+                source = _sources[key] = build()
+    return source
+
+
+def metrics_source(metrics) -> GridSource:
+    """Derived metrics followed by every item price (views of the CityMetrics arrays, no copies)."""
+    def build():
+        columns = {name: metrics.metric(name) for name in METRIC_COLUMNS}
+        columns.update((item, metrics.price(item)) for item in metrics.items)
+        return GridSource(metrics.city, columns, load_rank_index(metrics))
+    return _cached_source(metrics, 'metrics', build)
+
+
+def share_source(metrics, items) -> GridSource:
+    """Each item's share (%) of the summed cost of ``items`` per city, plus the Total."""
+    def build():
+        prices = np.nan_to_num(np.column_stack([metrics.price(item) for item in items]))
+        total = prices.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = prices / total[:, None] * 100
+        columns = {item: shares[:, j] for j, item in enumerate(items)}
+        columns['Total'] = total
+        # Shares are not the raw prices, so the rank index orders do not apply here
+        return GridSource(metrics.city, columns)
+    return _cached_source(metrics, ('share', tuple(items)), build)
+
+
+# -------------------- Streamlit widget --------------------
+def render_grid(source: GridSource, key: str, default_columns=None, gradient: bool = False, cities=None,
+                page_size: int = PAGE_SIZE):
+    """Paginated grid with column picker, city search, sort and range filter; sends one page per rerun."""
+    import streamlit as st
+
+    from perf_trace import chart
+
+    names = list(source.columns)
+    columns = st.multiselect("Columns", names, default=default_columns or names, key=f"{key}_columns")
+    c1, c2, c3 = st.columns([2, 2, 1])
+    search = c1.text_input("Search city", key=f"{key}_search")
+    sort = c2.selectbox("Sort by", ["(none)"] + source.names(), key=f"{key}_sort")
+    descending = c3.checkbox("Descending", value=True, key=f"{key}_desc")
+    value_range = None
+    with st.expander("Filter by value"):
+        f1, f2, f3 = st.columns([2, 1, 1])
+        filter_col = f1.selectbox("Column", ["(none)"] + names, key=f"{key}_fcol")
+        if filter_col != "(none)":
+            low = f2.number_input("Min", value=0.0, key=f"{key}_fmin")
+            high = f3.number_input("Max", value=1e9, key=f"{key}_fmax")
+            value_range = (filter_col, low, high)
+
+    rows = source.rows(None if sort == "(none)" else sort, descending, search, cities, value_range)
+    pages = max(1, -(-len(rows) // page_size))
+    # No max_value: a filter can shrink the page count below the page a session is on
+    page = min(st.number_input(f"Page (of {pages:,})", min_value=1, value=1, key=f"{key}_page"), pages) - 1
+    df, visible = source.window(rows, columns, page, page_size)
+    st.caption(f"Rows {page * page_size + min(1, len(df)):,}–{page * page_size + len(df):,} of {len(rows):,}")
+    chart(st.dataframe, source.styled(df, visible, columns) if gradient else df, hide_index=True, name=f"grid: {key}")
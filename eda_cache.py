@@ -0,0 +1,92 @@
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from city_metrics import METRIC_COLUMNS
+from lazy_imports import lazy_import
+
+
+# Least-squares line y = slope * x + intercept over the cities that have both values
+OLSFit = namedtuple('OLSFit', ['x', 'y', 'slope', 'intercept', 'r2', 'fitted', 'residuals'])
+
+# Statistics and figures for the current dataset version, shared by every session
+_cache = {"version": None, "entries": {}}
+# Re-entrant: figure builders call the cached statistics while holding it
+_lock = threading.RLock()
+
+
+def _cached(metrics, key, build):
+    with _lock:
+        if _cache["version"] != metrics.version:
+            _cache.update(version=metrics.version, entries={})
+        entries = _cache["entries"]
+        if key not in entries:
+            entries[key] = build()
+        return entries[key]
+
+
+def correlation(metrics) -> pd.DataFrame:
+    """Pairwise Pearson correlation of the derived metrics (the EDA heatmap)."""
+    return _cached(metrics, "corr", lambda: metrics.frame()[METRIC_COLUMNS].corr())
+
+
+def ols(metrics, x: str = 'Salary', y: str = 'Total Cost') -> OLSFit:
+    """OLS fit of one metric on another; fitted values and residuals are NaN where a city lacks either."""
+    def build():
+        xs, ys = metrics.metric(x), metrics.metric(y)
+        ok = ~(np.isnan(xs) | np.isnan(ys))
+        slope, intercept = np.polyfit(xs[ok], ys[ok], 1) if ok.sum() >= 2 else (np.nan, np.nan)
+        fitted = slope * xs + intercept
+        fitted[~ok] = np.nan
+        residuals = ys - fitted
+        total = np.sum((ys[ok] - ys[ok].mean()) ** 2)
+        r2 = 1 - np.nansum(residuals ** 2) / total if total > 0 else np.nan
+        return OLSFit(x, y, float(slope), float(intercept), float(r2), fitted, residuals)
+    return _cached(metrics, ("ols", x, y), build)
+
+
+def residual_table(metrics, fit: OLSFit, k: int = 5) -> pd.DataFrame:
+    """The ``k`` cities furthest above and the ``k`` furthest below the fitted line."""
+    ok = np.flatnonzero(~np.isnan(fit.residuals))
+    order = ok[np.argsort(fit.residuals[ok], kind='stable')]
+    rows = np.concatenate([order[::-1][:k], order[:k][::-1]]) if len(order) > 2 * k else order[::-1]
+    return pd.DataFrame({
+        'City': metrics.city[rows],
+        fit.x: metrics.metric(fit.x)[rows],
+        fit.y: metrics.metric(fit.y)[rows],
+        'Fitted': fit.fitted[rows],
+        'Residual': fit.residuals[rows],
+    })
+
+
+# -------------------- Figures --------------------
+def heatmap_figure(metrics):
+    """Annotated correlation heatmap (Plotly; replaces the seaborn/matplotlib PNG)."""
+    def build():
+        px = lazy_import("plotly.express", page="EDA")
+        corr = correlation(metrics)
+        fig = px.imshow(corr, text_auto=".2f", color_continuous_scale="RdBu_r", zmin=-1, zmax=1, aspect="auto")
+        fig.update_layout(height=550)
+        return fig
+    return _cached(metrics, "fig_corr", build)
+
+
+def salary_cost_figure(metrics):
+    """Salary vs Total Cost scatter with the cached overall OLS line."""
+    def build():
+        px = lazy_import("plotly.express", page="EDA")
+        fit = ols(metrics)
+        data = metrics.frame()
+        fig = px.scatter(
+            data, x='Salary', y='Total Cost',
+            color='City', size='Affordability Index',
+            hover_name='City',
+            title="Correlation between Salary and Total Cost"
+        )
+        xs = np.array([np.nanmin(data['Salary']), np.nanmax(data['Salary'])])
+        fig.add_scatter(x=xs, y=fit.slope * xs + fit.intercept, mode='lines',
+                        name=f"OLS fit (R² = {fit.r2:.2f})", line=dict(color='black', dash='dash'))
+        return fig
+    return _cached(metrics, "fig_salary_cost", build)
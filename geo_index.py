@@ -0,0 +1,228 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from city_map import CITY_COORDS
+from cost_data import dataset_version
+
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = np.pi * EARTH_RADIUS_KM / 180
+
+# Optional City,Latitude,Longitude file; CITY_COORDS is used when it does not exist
+COORDS_FILE = "city_coordinates.csv"
+_COORD_NAMES = {'city': 'City', 'latitude': 'Latitude', 'lat': 'Latitude',
+                'longitude': 'Longitude', 'lon': 'Longitude', 'lng': 'Longitude'}
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; works element-wise on arrays."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def coordinate_table(source=None) -> pd.DataFrame:
+    """Latitude / Longitude per City (the index) from a frame, a CSV path or a {city: [lat, lon]} dict.
+
+    Frames and CSVs need a City column and lat/lon columns (Latitude /
+    Longitude, or lat / lon, any case). With no source the table is read
+    from COORDS_FILE when it exists, else built from CITY_COORDS. Rows
+    without both coordinates are dropped; a repeated city keeps its last row.
+    """
+    if source is None:
+        source = COORDS_FILE if os.path.exists(COORDS_FILE) else CITY_COORDS
+    if isinstance(source, dict):
+        df = pd.DataFrame([(city, lat, lon) for city, (lat, lon) in source.items()],
+                          columns=['City', 'Latitude', 'Longitude'])
+    else:
+        df = pd.read_csv(source) if isinstance(source, (str, os.PathLike)) else source
+        df = df.rename(columns={col: _COORD_NAMES.get(str(col).strip().lower(), col) for col in df.columns})
+        missing = {'City', 'Latitude', 'Longitude'} - set(df.columns)
+        if missing:
+            raise ValueError(f"Coordinate table is missing columns: {sorted(missing)}")
+        df = df[['City', 'Latitude', 'Longitude']].assign(
+            City=df['City'].astype(str).str.strip(),
+            Latitude=pd.to_numeric(df['Latitude'], errors='coerce'),
+            Longitude=pd.to_numeric(df['Longitude'], errors='coerce'))
+    df = df.dropna().drop_duplicates('City', keep='last')
+    return df.set_index('City').astype(np.float64)
+
+
+class CityGeoIndex:
+    """Grid (lat/lon bucket) index over city coordinates.
+
+    Points are sorted by grid cell so every cell is one contiguous slice.
+    A radius query only visits the cells overlapping the query's
+    bounding box and computes exact haversine distances for those
+    candidates, so its cost depends on the neighbourhood, not on the
+    total number of cities. ``rows`` maps index entries back to rows of
+    the CityMetrics table the index was built from; ``coords`` is the
+    coordinate table (see coordinate_table) that city origins resolve
+    through, so it may also place cities that are not in the data.
+    """
+
+    def __init__(self, rows, lat, lon, cell_deg: float = 1.0, coords: pd.DataFrame = None):
+        self.coords = coordinate_table({}) if coords is None else coords
+        self.cell_deg = cell_deg
+        self.n_lat = int(np.ceil(180 / cell_deg))
+        self.n_lon = int(np.ceil(360 / cell_deg))
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        cell = self._cell(lat, lon)
+        order = np.argsort(cell, kind='stable')
+        self.rows = np.asarray(rows, dtype=np.intp)[order]
+        self.lat = lat[order]
+        self.lon = lon[order]
+        cell = cell[order]
+        starts = np.flatnonzero(np.r_[True, cell[1:] != cell[:-1]]) if len(cell) else np.array([], dtype=np.intp)
+        ends = np.r_[starts[1:], len(cell)]
+        self._slices = {int(cell[s]): (s, e) for s, e in zip(starts, ends)}
+
+    @classmethod
+    def from_metrics(cls, metrics, coords=None, cell_deg: float = 1.0) -> "CityGeoIndex":
+        """Index every city of the metrics table that has coordinates in ``coords`` (any coordinate_table source)."""
+        coords = coordinate_table(coords)
+        pos = coords.index.get_indexer(metrics.city)
+        rows = np.flatnonzero(pos >= 0)
+        lat = coords['Latitude'].to_numpy()[pos[rows]]
+        lon = coords['Longitude'].to_numpy()[pos[rows]]
+        return cls(rows, lat, lon, cell_deg, coords)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def locate(self, city: str):
+        """(lat, lon) of a city from the index's coordinate table; KeyError if it has none."""
+        if city not in self.coords.index:
+            raise KeyError(f"No coordinates for city: {city}")
+        lat, lon = self.coords.loc[city]
+        return lat, lon
+
+    def _lat_band(self, lat):
+        return np.clip(np.floor((np.asarray(lat) + 90) / self.cell_deg), 0, self.n_lat - 1).astype(np.int64)
+
+    def _lon_band(self, lon):
+        return (np.floor((np.asarray(lon) + 180) / self.cell_deg).astype(np.int64)) % self.n_lon
+
+    def _cell(self, lat, lon):
+        return self._lat_band(lat) * self.n_lon + self._lon_band(lon)
+
+    def _lon_cells(self, lo: float, hi: float) -> list:
+        """Longitude bands overlapping [lo, hi] degrees (less than 360 apart), across the antimeridian too.
+
+        When cell_deg does not divide 360 the last band is narrower, so a
+        range that wraps is split in degrees, not by counting bands.
+        """
+        shift = ((lo + 180) // 360) * 360
+        lo, hi = lo - shift, hi - shift
+        spans = [(lo, min(hi, 180))] + ([(-180, hi - 360)] if hi >= 180 else [])
+        last = self.n_lon - 1
+        cells = []
+        for a, b in spans:
+            first = min(int(np.floor((a + 180) / self.cell_deg)), last)
+            cells.extend(range(first, min(int(np.floor((b + 180) / self.cell_deg)), last) + 1))
+        return cells
+
+    def within(self, lat: float, lon: float, radius_km: float):
+        """Index rows within ``radius_km`` of a point, nearest first, with their distances."""
+        dlat = radius_km / KM_PER_DEG_LAT
+        lat_lo, lat_hi = int(self._lat_band(lat - dlat)), int(self._lat_band(lat + dlat))
+        cos_lat = min(np.cos(np.radians(lat - dlat)), np.cos(np.radians(lat + dlat)))
+        if lat + dlat >= 90 or lat - dlat <= -90 or cos_lat <= 0:
+            lon_cells = range(self.n_lon)
+        else:
+            dlon = dlat / cos_lat
+            if 2 * dlon >= 360:
+                lon_cells = range(self.n_lon)
+            else:
+                lon_cells = self._lon_cells(lon - dlon, lon + dlon)
+
+        picks = []
+        for lat_cell in range(lat_lo, lat_hi + 1):
+            base = lat_cell * self.n_lon
+            for lon_cell in lon_cells:
+                span = self._slices.get(base + lon_cell)
+                if span is not None:
+                    picks.append(np.arange(*span))
+        if not picks:
+            return np.array([], dtype=np.intp), np.array([], dtype=np.float64)
+        cand = np.concatenate(picks)
+        dist = haversine_km(lat, lon, self.lat[cand], self.lon[cand])
+        keep = dist <= radius_km
+        cand, dist = cand[keep], dist[keep]
+        order = np.argsort(dist, kind='stable')
+        return self.rows[cand[order]], dist[order]
+
+    def nearest(self, lat: float, lon: float, k: int = 5):
+        """The ``k`` closest cities to a point (rows, distances), nearest first."""
+        k = min(k, len(self))
+        radius = self.cell_deg * KM_PER_DEG_LAT
+        while True:
+            rows, dist = self.within(lat, lon, radius)
+            if len(rows) >= k or radius > np.pi * EARTH_RADIUS_KM:
+                return rows[:k], dist[:k]
+            radius *= 2
+
+
+# -------------------- Queries --------------------
+def _origin(index, city_or_point):
+    if isinstance(city_or_point, str):
+        return index.locate(city_or_point)
+    return city_or_point
+
+
+def _result(metrics, rows, dist) -> pd.DataFrame:
+    df = metrics.frame(metrics.city[rows])
+    df.insert(1, 'Distance (km)', np.round(dist, 1))
+    return df
+
+
+def most_affordable_within(metrics, index, origin, radius_km: float = 300, k: int = 5) -> pd.DataFrame:
+    """The ``k`` cities with the highest Affordability Index within ``radius_km`` of a city or (lat, lon)."""
+    lat, lon = _origin(index, origin)
+    rows, dist = index.within(lat, lon, radius_km)
+    score = np.nan_to_num(metrics.metric('Affordability Index')[rows], nan=-np.inf)
+    if len(rows) > k:
+        top = np.argpartition(-score, k - 1)[:k]
+        rows, dist, score = rows[top], dist[top], score[top]
+    order = np.argsort(-score, kind='stable')
+    return _result(metrics, rows[order], dist[order])
+
+
+def within_budget(metrics, index, origin, radius_km: float, budget: float) -> pd.DataFrame:
+    """Cities within ``radius_km`` whose Total Cost is below ``budget``, nearest first."""
+    lat, lon = _origin(index, origin)
+    rows, dist = index.within(lat, lon, radius_km)
+    keep = metrics.metric('Total Cost')[rows] < budget
+    return _result(metrics, rows[keep], dist[keep])
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def load_geo_index(metrics, coords_file: str = COORDS_FILE) -> CityGeoIndex:
+    """Shared index for a CityMetrics version and coordinates file, built on first use.
+
+    The coordinates come from ``coords_file`` when it exists, else from
+    CITY_COORDS; editing the file builds a new index like a new data version.
+    """
+    coords_version = dataset_version(coords_file) if os.path.exists(coords_file) else None
+    key = (metrics.version, coords_version)
+    index = _indexes.get(key)
+    if index is None:
+        with _lock:
+            index = _indexes.get(key)
+            if index is None:
+                parent = _indexes.get((metrics.parent_version, coords_version))
+                # A patch that kept every row in place leaves the index (rows + coordinates) valid
+                if parent is not None and metrics.same_rows:
+                    index = parent
+                else:
+                    index = CityGeoIndex.from_metrics(metrics, coords_file if coords_version else CITY_COORDS)
+                _indexes.clear()
+                _indexes[key] = index
+    return index
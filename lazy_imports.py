@@ -0,0 +1,66 @@
+import importlib
+import subprocess
+import sys
+import threading
+import time
+
+import pandas as pd
+
+
+# Rendering stack each dashboard page pulls in on first use
+PAGE_IMPORTS = {
+    "Home": [],
+    "About": [],
+    "Filter & Insights": ["plotly.express", "folium", "folium.plugins"],
+    "EDA": ["plotly.express"],
+    "Recommendations": ["plotly.express"],
+    "Contact": [],
+}
+
+# module name -> (page that first needed it, seconds spent importing it)
+_import_times = {}
+_lock = threading.Lock()
+
+
+def lazy_import(name: str, page: str = None):
+    """Import a module on first use and remember how long that first import took.
+
+    Later calls are a sys.modules lookup, so pages can call this on
+    every rerun without paying for it again.
+    """
+    module = sys.modules.get(name)
+    if module is not None and name in _import_times:
+        return module
+    with _lock:
+        if name in _import_times:
+            return sys.modules[name]
+        already_loaded = name in sys.modules
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        _import_times[name] = (page, 0.0 if already_loaded else time.perf_counter() - start)
+    return module
+
+
+def import_report() -> pd.DataFrame:
+    """Modules imported lazily in this process, with the page that paid for them."""
+    rows = [(page or "-", name, round(seconds * 1000, 1)) for name, (page, seconds) in _import_times.items()]
+    return pd.DataFrame(rows, columns=["Page", "Module", "Import (ms)"])
+
+
+def cold_start_report(pages=None) -> pd.DataFrame:
+    """Time each page's imports in a fresh interpreter, i.e. what a new container pays."""
+    rows = []
+    for page, modules in (pages or PAGE_IMPORTS).items():
+        code = (
+            "import time, streamlit, pandas\n"
+            "t = time.perf_counter()\n"
+            + "".join(f"import {m}\n" for m in modules)
+            + "print(time.perf_counter() - t)\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        rows.append((page, ", ".join(modules) or "-", round(float(out.stdout) * 1000, 1)))
+    return pd.DataFrame(rows, columns=["Page", "Modules", "Cold import (ms)"])
+
+
+if __name__ == "__main__":
+    print(cold_start_report().to_string(index=False))
@@ -0,0 +1,46 @@
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+
+# Tab outputs for the current dataset version, shared by every session
+_cache = {"version": None, "entries": OrderedDict()}
+_lock = threading.Lock()
+# Entries kept per version, least recently used dropped first (inputs such as city lists are open-ended)
+MAX_ENTRIES = 64
+
+
+def lazy_tabs(labels, key: str) -> str:
+    """Tab strip that only runs the selected tab's body.
+
+    ``st.tabs`` executes and ships every tab on every rerun. Here the
+    active tab is a widget value kept in session state, and the page
+    wraps each body in ``if active == label:`` so the others cost nothing.
+    """
+    return st.radio("Section", labels, key=key, horizontal=True, label_visibility="collapsed")
+
+
+def tab_cache(metrics, key, build):
+    """Process-wide cache of a tab's expensive output (figures, tables).
+
+    ``key`` names the tab and the inputs the output depends on; the
+    dataset version is part of every key, and a new version drops the
+    old entries. Every session reuses the same objects, so nothing is
+    copied into ``st.session_state``.
+    """
+    with _lock:
+        if _cache["version"] != metrics.version:
+            _cache.update(version=metrics.version, entries=OrderedDict())
+        entries = _cache["entries"]
+        if key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+    value = build()
+    with _lock:
+        if _cache["version"] == metrics.version:
+            entries = _cache["entries"]
+            entries[key] = value
+            while len(entries) > MAX_ENTRIES:
+                entries.popitem(last=False)
+    return value
@@ -0,0 +1,148 @@
+"""Memory held by the dashboard: the shared caches, one session's state, the process.
+
+Every module-level cache listed in SHARED_CACHES is shared by all
+Streamlit sessions in the process, so it is paid once; what grows with
+the number of sessions is each session's ``st.session_state``. Sizes are
+deep: arrays count their buffer (a view counts nothing new), frames and
+indexes their ``memory_usage(deep=True)``, containers and objects their
+contents. An object reachable from two caches is counted under the
+first one only, so the rows add up to what the caches really hold.
+
+    python memory_report.py                      # after loading the data
+    DASHBOARD_COMPACT=1 python memory_report.py  # float32 price matrix
+"""
+import os
+import sys
+import types
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+# (label, module, module-level cache); modules that were never imported are skipped
+SHARED_CACHES = [
+    ("CityMetrics", "city_metrics", "_models"),
+    ("Derived frames (legacy load_city_data)", "cost_data", "_frames"),
+    ("Row-delta baselines", "cost_data", "_baselines"),
+    ("Rank index", "rank_index", "_indexes"),
+    ("Region stats", "regions", "_stats"),
+    ("Geo index", "geo_index", "_indexes"),
+    ("Grid sources", "data_grid", "_sources"),
+    ("Basket prices", "basket", "_zeroed"),
+    ("EDA statistics + figures", "eda_cache", "_cache"),
+    ("Map popups + HTML", "city_map", "_cache"),
+    ("Tab figures + tables", "lazy_tabs", "_cache"),
+    ("Upload jobs", "upload_pipeline", "_jobs"),
+    ("Snapshot catalogs", "snapshots", "_stores"),
+    ("Timing samples", "perf_trace", "_samples"),
+]
+
+# Never descended into: code, not data
+_SKIP = (types.ModuleType, type, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_size(obj, seen: set = None) -> int:
+    """Approximate bytes reachable from ``obj`` that are not already in ``seen``."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, _SKIP):
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        if isinstance(obj.base, np.ndarray):
+            # A view: the memory belongs to (and is counted with) its base
+            return deep_size(obj.base, seen)
+        size = obj.nbytes
+        if obj.dtype == object:
+            size += sum(deep_size(item, seen) for item in obj.flat)
+        return size
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(obj, pd.Index):
+        # Values + hash table (once built); object labels are often shared with an array counted elsewhere
+        size = int(obj.memory_usage())
+        if obj.dtype == object:
+            size += sum(deep_size(item, seen) for item in obj)
+        return size
+    if isinstance(obj, pd.Categorical):
+        return int(obj.memory_usage(deep=True))
+    if hasattr(obj, "to_plotly_json"):
+        # Plotly figures: the JSON is what they hold (and ship)
+        return len(obj.to_json())
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    return size
+
+
+def process_rss() -> int:
+    """Resident set size of this process in bytes (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _entries(cache) -> int:
+    # {"version": ..., "entries": {...}}-style caches count what they hold for that version
+    if isinstance(cache, dict) and "version" in cache:
+        return sum(len(value) for value in cache.values() if isinstance(value, dict))
+    return len(cache)
+
+
+def shared_report(seen: set = None) -> pd.DataFrame:
+    """One row per loaded shared cache: entries and MiB it holds."""
+    seen = set() if seen is None else seen
+    rows = []
+    for label, module_name, attr in SHARED_CACHES:
+        module = sys.modules.get(module_name)
+        cache = getattr(module, attr, None) if module is not None else None
+        if cache is None:
+            continue
+        rows.append((label, _entries(cache), round(deep_size(cache, seen) / 2 ** 20, 2)))
+    return pd.DataFrame(rows, columns=["Cache", "Entries", "MiB"])
+
+
+def session_report(session_state, seen: set = None) -> pd.DataFrame:
+    """MiB held by each key of one session's state, largest first."""
+    seen = set() if seen is None else seen
+    state = session_state.to_dict() if hasattr(session_state, "to_dict") else dict(session_state)
+    rows = [(str(key), type(value).__name__, round(deep_size(value, seen) / 2 ** 20, 3))
+            for key, value in state.items()]
+    return pd.DataFrame(rows, columns=["Key", "Type", "MiB"]).sort_values("MiB", ascending=False, kind="stable")
+
+
+def memory_report(session_state=None):
+    """(process RSS in MiB, shared caches, this session's state).
+
+    Shared caches are measured first, so session rows only count what the
+    session holds on its own (not, say, the shared model it points at).
+    """
+    seen = set()
+    shared = shared_report(seen)
+    session = session_report(session_state if session_state is not None else {}, seen)
+    return round(process_rss() / 2 ** 20, 1), shared, session
+
+
+if __name__ == "__main__":
+    from city_metrics import load_city_metrics
+    from cost_data import DATA_FILE
+    from rank_index import load_rank_index
+    from regions import load_region_stats
+
+    metrics = load_city_metrics(sys.argv[1] if len(sys.argv) > 1 else DATA_FILE)
+    load_rank_index(metrics)
+    load_region_stats(metrics)
+    rss, shared, _ = memory_report()
+    print(f"{len(metrics):,} cities x {len(metrics.items)} items, prices {metrics.prices.dtype}; RSS {rss} MiB")
+    print(shared.to_string(index=False))
@@ -0,0 +1,143 @@
+"""Hot-path timings for the dashboard and the data layer.
+
+Wrap a step in ``with stage("load: derive"):`` and its wall time is
+recorded three ways:
+
+* in the trace of the current rerun (``run_trace``), for the debug panel;
+* in a process-wide sample window per stage (``percentiles``), shared by
+  every session, so p50/p90/p99 reflect real traffic;
+* as one JSON line per stage in ``$DASHBOARD_PERF_LOG`` when that
+  variable is set, for offline analysis across processes:
+
+      DASHBOARD_PERF_LOG=perf.jsonl streamlit run dashhh12.py
+      python perf_trace.py perf.jsonl
+
+Timing is two perf_counter calls per stage. Payload sizes (plotly JSON,
+pyplot PNG, map HTML) cost a serialisation, so ``chart`` only measures
+them when the rerun was started with ``payloads=True``.
+"""
+import io
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+LOG_ENV = "DASHBOARD_PERF_LOG"
+# Most recent samples kept per stage for the percentiles
+SAMPLE_LIMIT = 2000
+
+# stage name -> deque of seconds
+_samples = {}
+_lock = threading.Lock()
+# The Streamlit script thread's current rerun: session, payloads flag, records, depth
+_run = threading.local()
+
+
+def _log(record: dict):
+    path = os.environ.get(LOG_ENV)
+    if not path:
+        return
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _lock:
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+@contextmanager
+def stage(name: str):
+    """Time the enclosed block as ``name``; yields the record so callers can add fields (e.g. bytes)."""
+    depth = getattr(_run, "depth", 0)
+    record = {"stage": name, "depth": depth}
+    records = getattr(_run, "records", None)
+    if records is not None:
+        # Appended on entry so the trace reads in start order; "ms" is filled in on exit
+        records.append(record)
+    _run.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        seconds = time.perf_counter() - start
+        _run.depth = depth
+        record["ms"] = seconds * 1000
+        with _lock:
+            _samples.setdefault(name, deque(maxlen=SAMPLE_LIMIT)).append(seconds)
+        _log({"ts": time.time(), "session": getattr(_run, "session", None), **record})
+
+
+@contextmanager
+def begin_run(session: str = None, payloads: bool = False):
+    """Start a fresh per-rerun trace on this thread (one per Streamlit script run)."""
+    _run.session, _run.payloads, _run.records, _run.depth = session, payloads, [], 0
+    with stage("rerun"):
+        yield
+
+
+def run_trace() -> pd.DataFrame:
+    """Stages of the current rerun in start order, nested stages indented."""
+    records = getattr(_run, "records", None) or []
+    rows = [("  " * r["depth"] + r["stage"], round(r.get("ms", float("nan")), 2), r.get("bytes")) for r in records]
+    return pd.DataFrame(rows, columns=["Stage", "Time (ms)", "Payload (bytes)"])
+
+
+def percentiles(samples: dict = None) -> pd.DataFrame:
+    """Per-stage call count and p50/p90/p99/max in ms (defaults to this process's samples)."""
+    if samples is None:
+        with _lock:
+            samples = {name: list(values) for name, values in _samples.items()}
+    rows = []
+    for name, values in sorted(samples.items()):
+        ms = np.asarray(values, dtype=np.float64) * 1000
+        p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+        rows.append((name, len(ms), round(p50, 2), round(p90, 2), round(p99, 2), round(ms.max(), 2)))
+    return pd.DataFrame(rows, columns=["Stage", "Calls", "p50 (ms)", "p90 (ms)", "p99 (ms)", "Max (ms)"])
+
+
+def payload_size(obj) -> int:
+    """Approximate bytes shipped to the browser for a plotly figure, pyplot figure, HTML string or frame."""
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8"))
+    if isinstance(getattr(obj, "data", None), pd.DataFrame):
+        # pandas Styler: the cells are what gets shipped
+        obj = obj.data
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if hasattr(obj, "to_json"):
+        return len(obj.to_json())
+    if hasattr(obj, "savefig"):
+        buf = io.BytesIO()
+        obj.savefig(buf, format="png")
+        return buf.tell()
+    return None
+
+
+def chart(draw, obj, *args, name: str = None, **kwargs):
+    """Call ``draw(obj, ...)`` (st.plotly_chart, st.pyplot, st.iframe, ...) as a timed stage."""
+    # Sized before the timer starts, so the measurement does not inflate the chart's time
+    size = payload_size(obj) if getattr(_run, "payloads", False) else None
+    with stage(f"chart: {name or getattr(draw, '__name__', 'draw')}") as record:
+        if size is not None:
+            record["bytes"] = size
+        return draw(obj, *args, **kwargs)
+
+
+def read_log(path: str) -> dict:
+    """Stage name -> seconds, from a JSON-lines log written by any number of processes."""
+    samples = {}
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            record = json.loads(line)
+            samples.setdefault(record["stage"], []).append(record["ms"] / 1000)
+    return samples
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(percentiles(read_log(sys.argv[1] if len(sys.argv) > 1 else os.environ[LOG_ENV])).to_string(index=False))
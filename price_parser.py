@@ -0,0 +1,67 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+# Unit markers that may follow an amount, e.g. "1,500,000.00 ₹" or "7.5 %"
+UNIT_MARKERS = {'₹': 'INR', '%': 'percent'}
+
+ParsedPrices = namedtuple('ParsedPrices', ['values', 'columns', 'units', 'errors'])
+
+
+def detect_unit(column: str, marker_counts: dict) -> str:
+    """Pick the unit of a column from its header and the markers found in its cells."""
+    if '%' in column or 'percent' in column.lower():
+        return 'percent'
+    marker, count = max(marker_counts.items(), key=lambda item: item[1])
+    return UNIT_MARKERS[marker] if count else 'number'
+
+
+def parse_prices(raw: pd.DataFrame, columns=None) -> ParsedPrices:
+    """Parse every price column of the raw CSV frame in one vectorized pass.
+
+    All cells are stacked into a single string column, stripped of
+    thousands separators and unit markers with plain (non-regex)
+    replaces, converted to float64 in one go and reshaped back into a
+    (cities x columns) matrix. Empty cells become NaN. Cells that are
+    present but are not an amount also become NaN and are listed in
+    ``errors`` (row, column, value) instead of being turned into 0.
+    """
+    if columns is None:
+        columns = [col for col in raw.columns if col != 'City']
+    columns = list(columns)
+    n_rows, n_cols = len(raw), len(columns)
+
+    # Column-major stack: cells of column j live in [j * n_rows, (j + 1) * n_rows)
+    cells = np.concatenate([raw[col].to_numpy(dtype=object) for col in columns]) if n_cols else np.array([], dtype=object)
+    present = pd.notna(cells)
+    text = pd.Series(np.where(present, cells, ''), dtype=object).astype(str)
+
+    marker_hits = {marker: text.str.contains(marker, regex=False).to_numpy() for marker in UNIT_MARKERS}
+    stripped = text.str.replace(',', '', regex=False)
+    for marker in UNIT_MARKERS:
+        stripped = stripped.str.replace(marker, '', regex=False)
+    stripped = stripped.str.strip()
+
+    try:
+        flat = stripped.astype(np.float64).to_numpy()
+    except (TypeError, ValueError):
+        # Blank or malformed cells somewhere: fall back to the coercing parser
+        flat = pd.to_numeric(stripped, errors='coerce').to_numpy(dtype=np.float64)
+
+    bad = np.isnan(flat) & (stripped != '').to_numpy()
+    values = flat.reshape(n_cols, n_rows).T
+
+    units = {}
+    for j, col in enumerate(columns):
+        rows = slice(j * n_rows, (j + 1) * n_rows)
+        units[col] = detect_unit(col, {marker: int(hits[rows].sum()) for marker, hits in marker_hits.items()})
+
+    bad_cols, bad_rows = np.divmod(np.flatnonzero(bad), n_rows)
+    errors = pd.DataFrame({
+        'row': bad_rows,
+        'column': np.asarray(columns, dtype=object)[bad_cols],
+        'value': cells[bad],
+    })
+    return ParsedPrices(values, columns, units, errors)
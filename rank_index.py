@@ -0,0 +1,120 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from city_metrics import METRIC_COLUMNS
+
+
+class RankIndex:
+    """Sort order, dense rank and percentile of every city in every column.
+
+    Columns are all item prices of a CityMetrics plus its METRIC_COLUMNS.
+    Everything is computed with one column-wise argsort when the index is
+    built (once per dataset version); afterwards a top-k list is a slice
+    of a stored permutation and a city's rank is an array lookup, so no
+    page sorts the table again. Ranks are dense and ascending (1 = lowest
+    value); the percentile is the share of cities with a value at or
+    below the city's. Missing values sort last and have rank 0 and a NaN
+    percentile.
+    """
+
+    def __init__(self, metrics):
+        self.version = metrics.version
+        self.city = metrics.city
+        self.columns = list(metrics.items) + METRIC_COLUMNS
+        self._col_pos = {name: j for j, name in enumerate(self.columns)}
+        # City lookups go through the model's city index; no second name -> row table
+        self._positions = metrics.positions
+
+        values = np.hstack([metrics.prices, metrics.values])
+        n, m = values.shape
+        order = np.argsort(values, axis=0, kind='stable')
+        ordered = np.take_along_axis(values, order, axis=0)
+        self.count = (~np.isnan(values)).sum(axis=0)
+
+        # Dense rank: a new rank starts wherever the sorted value changes
+        step = np.vstack([np.ones((min(n, 1), m), dtype=bool), ordered[1:] != ordered[:-1]])
+        dense_sorted = np.cumsum(step, axis=0, dtype=np.int32)
+        # Percentile: position of the last city tied with this value, over the non-missing count
+        last_tie = np.empty((n, m), dtype=np.float32)
+        for j in range(m):
+            col = ordered[:self.count[j], j]
+            last_tie[:self.count[j], j] = np.searchsorted(col, col, side='right')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_sorted = 100 * last_tie / self.count.astype(np.float32)
+        missing = np.arange(n)[:, None] >= self.count[None, :]
+        dense_sorted[missing] = 0
+        pct_sorted[missing] = np.nan
+
+        # Stored column-major, so one column's permutation / ranks are contiguous
+        dtype = np.int32 if n < 2 ** 31 else np.int64
+        self.order = np.ascontiguousarray(order.T, dtype=dtype)
+        self.dense = np.empty((m, n), dtype=np.int32)
+        self.percentile = np.empty((m, n), dtype=np.float32)
+        cols = np.arange(m)[:, None]
+        self.dense[cols, self.order] = dense_sorted.T
+        self.percentile[cols, self.order] = pct_sorted.T
+        self.city_order = np.argsort(self.city.astype(str), kind='stable')
+        for arr in (self.order, self.dense, self.percentile, self.count, self.city_order):
+            arr.flags.writeable = False
+
+    # -------------------- Lookups --------------------
+    def _row(self, city: str) -> int:
+        rows = self._positions([city])
+        if not len(rows):
+            raise KeyError(city)
+        return int(rows[0])
+
+    def sorted_rows(self, column: str, descending: bool = False) -> np.ndarray:
+        """All row positions ordered by ``column`` (missing values last either way)."""
+        j = self._col_pos[column]
+        if not descending:
+            return self.order[j]
+        present = self.order[j, :self.count[j]]
+        return np.concatenate([present[::-1], self.order[j, self.count[j]:]])
+
+    def top(self, column: str, k: int, descending: bool = True) -> np.ndarray:
+        """Row positions of the ``k`` highest (or lowest) non-missing values; O(k)."""
+        j = self._col_pos[column]
+        c = int(self.count[j])
+        k = min(k, c)
+        return self.order[j, c - k:c][::-1] if descending else self.order[j, :k]
+
+    def rank(self, city: str, column: str):
+        """(dense rank, number of distinct values, percentile) of one city in one column; O(1)."""
+        i, j = self._row(city), self._col_pos[column]
+        distinct = int(self.dense[j, self.order[j, self.count[j] - 1]]) if self.count[j] else 0
+        return int(self.dense[j, i]), distinct, round(float(self.percentile[j, i]), 2)
+
+    def city_ranks(self, city: str) -> pd.DataFrame:
+        """Where one city stands in every column, 1 = cheapest / lowest."""
+        i = self._row(city)
+        return pd.DataFrame({
+            'Column': self.columns,
+            'Rank': self.dense[:, i],
+            'Cities': self.count,
+            'Percentile': np.round(self.percentile[:, i].astype(np.float64), 1),
+        })
+
+
+def ranked_frame(metrics, rows) -> pd.DataFrame:
+    """metrics.frame for the given row positions, in that order."""
+    return metrics.frame(metrics.city[rows])
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def load_rank_index(metrics) -> RankIndex:
+    """Shared index for a CityMetrics version, built on first use."""
+    index = _indexes.get(metrics.version)
+    if index is None:
+        with _lock:
+            index = _indexes.get(metrics.version)
+            if index is None:
+                index = RankIndex(metrics)
+                _indexes.clear()
+                _indexes[metrics.version] = index
+    return index
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+
+# The original fixed score: Salary / (Rent + Transport + Milk + Rice)
+DEFAULT_WEIGHTS = {
+    'Apartment (1 bedroom) in City Centre': 1.0,
+    'Monthly Pass (Regular Price)': 1.0,
+    'Milk (regular), (1 liter)': 1.0,
+    'Rice (white), (1kg)': 1.0,
+}
+
+
+def basket_cost(metrics, weights: dict) -> np.ndarray:
+    """Weighted monthly cost of the given items for every city (missing prices count as 0)."""
+    items = [item for item, w in weights.items() if w]
+    if not items:
+        return np.zeros(len(metrics))
+    cols = [metrics.items.index(item) for item in items]
+    w = np.array([weights[item] for item in items], dtype=np.float64)
+    return np.nan_to_num(metrics.prices[:, cols]) @ w
+
+
+def recommend(metrics, weights: dict = None, budget: float = None, k: int = 5) -> pd.DataFrame:
+    """Top ``k`` cities by Salary / weighted basket cost.
+
+    ``weights`` maps any item column to a monthly quantity (defaults to
+    DEFAULT_WEIGHTS). Cities whose basket costs more than ``budget`` are
+    dropped. Scores are one matrix-vector product over the prebuilt price
+    matrix and the top k come from argpartition, so nothing is copied or
+    fully sorted.
+    """
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    cost = basket_cost(metrics, weights)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = metrics.metric('Salary') / cost
+    score = np.nan_to_num(score, nan=0.0, posinf=0.0, neginf=0.0)
+
+    candidates = np.arange(len(score))
+    if budget:
+        candidates = candidates[cost <= budget]
+    if len(candidates) > k:
+        part = np.argpartition(-score[candidates], k - 1)[:k]
+        candidates = candidates[part]
+    top = candidates[np.lexsort((candidates, -score[candidates]))]
+
+    df = metrics.frame(metrics.city[top])
+    df['Basket Cost'] = cost[top]
+    df['Affordability Score'] = score[top]
+    return df
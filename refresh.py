@@ -0,0 +1,116 @@
+"""Watch the data files and apply their changes as row deltas.
+
+A watcher thread polls each file's mtime/size (stdlib only, so it works
+the same on every host). When a file changes it calls load_city_metrics,
+which reads the change as a cost_data.RowDelta and patches the shared
+CityMetrics for the changed cities only; the new content hash becomes
+the dataset version. Caches keyed on the version then refresh only what
+the patch touched (see ``CityMetrics.changed``). Sessions pick the new
+version up on their next rerun.
+
+    python refresh.py [csv ...]      # watch and print every applied delta
+"""
+import os
+import threading
+import time
+
+from city_metrics import load_city_metrics
+from cost_data import DATA_FILE, seed_baseline
+
+
+POLL_SECONDS = 5.0
+
+# abspath -> running DataWatcher
+_watchers = {}
+_lock = threading.Lock()
+
+
+class DataWatcher(threading.Thread):
+    """Daemon thread that keeps the shared CityMetrics of one file up to date."""
+
+    def __init__(self, path: str, interval: float = POLL_SECONDS):
+        super().__init__(name=f"watch:{os.path.basename(path)}", daemon=True)
+        self.path = os.path.abspath(path)
+        self.interval = interval
+        self.listeners = []
+        self._stop_event = threading.Event()
+
+    def add_listener(self, callback):
+        """Call ``callback(model)`` for the first load and after every refresh that produced a new version."""
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def _notify(self, model):
+        for callback in self.listeners:
+            callback(model)
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def run(self):
+        last = self._stat()
+        try:
+            # Row hashes of the current file, so the first change is already a delta
+            seed_baseline(self.path)
+            model = load_city_metrics(self.path)
+        except (OSError, KeyError, ValueError):
+            version = None
+        else:
+            version = model.version
+            self._notify(model)
+        while not self._stop_event.wait(self.interval):
+            current = self._stat()
+            if current is None or current == last:
+                continue
+            last = current
+            try:
+                model = load_city_metrics(self.path)
+            except (OSError, KeyError, ValueError):
+                # Half-written file; the next poll sees the finished one
+                last = None
+                continue
+            if model.version != version:
+                version = model.version
+                self._notify(model)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+def start_watcher(path: str = DATA_FILE, interval: float = POLL_SECONDS, listeners=()) -> DataWatcher:
+    """Start (once per file and process) the watcher for ``path`` and return it.
+
+    ``listeners`` are registered before the thread starts, so they also see the first load.
+    """
+    key = os.path.abspath(path)
+    with _lock:
+        watcher = _watchers.get(key)
+        if watcher is None or not watcher.is_alive():
+            watcher = DataWatcher(key, interval)
+            for callback in listeners:
+                watcher.add_listener(callback)
+            watcher.start()
+            _watchers[key] = watcher
+        else:
+            for callback in listeners:
+                watcher.add_listener(callback)
+    return watcher
+
+
+def describe(model) -> str:
+    if model.parent_version is None:
+        return f"{model.version[:10]}: full reload ({len(model):,} cities)"
+    return f"{model.parent_version[:10]} -> {model.version[:10]}: {len(model.changed):,} cities patched"
+
+
+if __name__ == "__main__":
+    import sys
+
+    for csv_path in sys.argv[1:] or [DATA_FILE]:
+        start_watcher(csv_path, listeners=[lambda model: print(describe(model), flush=True)])
+    while True:
+        time.sleep(3600)
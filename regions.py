@@ -0,0 +1,119 @@
+"""Per-region aggregates of every item price and derived metric.
+
+The region of a city is the categorical ``CityMetrics.region`` (see
+city_map.REGION_MAP). RegionStats groups the city rows by region code
+once per dataset version and keeps count / mean / min / quartiles / max
+of every column for every region in one (stat, region, column) array, so
+a region filter is a stored row list and a region ranking is a sort of
+at most len(REGIONS) numbers.
+
+A model built by ``CityMetrics.patched`` only changes the regions of its
+``changed`` cities; the other regions keep the aggregates of the version
+it was patched from.
+"""
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from city_map import REGIONS, region_of
+from city_metrics import METRIC_COLUMNS
+
+
+STATS = ['count', 'mean', 'min', 'p25', 'median', 'p75', 'max']
+
+
+def _aggregate(block: np.ndarray) -> np.ndarray:
+    """STATS x columns for one region's rows (NaN where a column has no values)."""
+    out = np.full((len(STATS), block.shape[1]), np.nan)
+    out[0] = (~np.isnan(block)).sum(axis=0)
+    if len(block):
+        with warnings.catch_warnings():
+            # All-NaN columns are expected; they just give NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            out[1] = np.nanmean(block, axis=0)
+            out[2] = np.nanmin(block, axis=0)
+            out[3:6] = np.nanpercentile(block, [25, 50, 75], axis=0)
+            out[6] = np.nanmax(block, axis=0)
+    return out
+
+
+class RegionStats:
+    """Row positions and STATS of every column for every region of one CityMetrics version."""
+
+    def __init__(self, metrics, previous: "RegionStats" = None):
+        self.version = metrics.version
+        self.city = metrics.city
+        self.columns = list(metrics.items) + METRIC_COLUMNS
+        self._col_pos = {name: j for j, name in enumerate(self.columns)}
+
+        codes = metrics.region.codes
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(REGIONS) + 1))
+        self.rows = {region: order[bounds[k]:bounds[k + 1]] for k, region in enumerate(REGIONS)}
+
+        reuse = (previous is not None and previous.version == metrics.parent_version
+                 and previous.columns == self.columns)
+        affected = set(region_of(sorted(metrics.changed))) if reuse else set(REGIONS)
+        values = np.hstack([metrics.prices, metrics.values])
+        self.table = np.empty((len(STATS), len(REGIONS), len(self.columns)))
+        for k, region in enumerate(REGIONS):
+            if region in affected:
+                self.table[:, k] = _aggregate(values[self.rows[region]])
+            else:
+                self.table[:, k] = previous.table[:, k]
+        for arr in (self.table, *self.rows.values()):
+            arr.flags.writeable = False
+
+    # -------------------- Lookups --------------------
+    def present(self) -> list:
+        """Regions with at least one city, in REGIONS order."""
+        return [region for region in REGIONS if len(self.rows[region])]
+
+    def cities_in(self, region: str) -> np.ndarray:
+        """City names of one region, in dataset order."""
+        return self.city[self.rows[region]]
+
+    def stat_frame(self, stat: str = 'median', columns=None) -> pd.DataFrame:
+        """Region x column table of one statistic (regions without cities left out)."""
+        columns = list(columns or self.columns)
+        keep = [REGIONS.index(region) for region in self.present()]
+        cols = [self._col_pos[col] for col in columns]
+        return pd.DataFrame(self.table[STATS.index(stat)][np.ix_(keep, cols)],
+                            index=pd.Index(self.present(), name='Region'), columns=columns)
+
+    def summary(self, region: str, columns=None) -> pd.DataFrame:
+        """Column x STATS table for one region."""
+        columns = list(columns or self.columns)
+        cols = [self._col_pos[col] for col in columns]
+        df = pd.DataFrame(self.table[:, REGIONS.index(region), cols].T, columns=STATS)
+        df['count'] = df['count'].astype(np.int64)
+        df.insert(0, 'Column', columns)
+        return df
+
+    def rank_regions(self, column: str, stat: str = 'median', descending: bool = False) -> pd.DataFrame:
+        """Regions ordered by one statistic of one column; dense Rank 1 = lowest (or highest if descending)."""
+        df = self.stat_frame(stat, [column]).reset_index()
+        df['Cities'] = [len(self.rows[region]) for region in df['Region']]
+        df = df.dropna(subset=[column]).sort_values(column, ascending=not descending, kind='stable')
+        df['Rank'] = df[column].rank(method='dense', ascending=not descending).astype(int)
+        return df.reset_index(drop=True)
+
+
+_stats = {}
+_lock = threading.Lock()
+
+
+def load_region_stats(metrics) -> RegionStats:
+    """Shared stats for a CityMetrics version; a patched model reuses its parent's unaffected regions."""
+    stats = _stats.get(metrics.version)
+    if stats is None:
+        with _lock:
+            stats = _stats.get(metrics.version)
+            if stats is None:
+                previous = _stats.get(metrics.parent_version)
+                stats = RegionStats(metrics, previous)
+                _stats.clear()
+                _stats[metrics.version] = stats
+    return stats
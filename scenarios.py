@@ -0,0 +1,77 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+ScenarioResult = namedtuple('ScenarioResult', ['cost', 'surplus', 'fit'])
+
+
+def _numeric(frame: pd.DataFrame, what: str) -> pd.DataFrame:
+    """``frame`` as numbers; ValueError naming the first cell that is filled in but not a number."""
+    values = frame.apply(pd.to_numeric, errors='coerce')
+    bad = values.isna() & frame.notna()
+    if bad.to_numpy().any():
+        col = bad.any().idxmax()
+        row = bad[col].idxmax()
+        raise ValueError(f"Non-numeric {what} in column '{col}', row {row}: {frame.at[row, col]!r} "
+                         f"({int(bad.to_numpy().sum())} non-numeric cells in total)")
+    return values
+
+
+def quantity_matrix(metrics, scenarios: pd.DataFrame) -> np.ndarray:
+    """Scenario x item quantity matrix aligned with metrics.items (unlisted items and blank cells are 0)."""
+    unknown = [col for col in scenarios.columns if col not in ('Scenario', 'Budget') and col not in metrics.items]
+    if unknown:
+        raise KeyError(f"Unknown item columns in scenarios: {', '.join(unknown)}")
+    quantities = scenarios.reindex(columns=metrics.items, fill_value=0)
+    return _numeric(quantities, 'quantity').fillna(0).to_numpy(dtype=np.float64)
+
+
+def evaluate_scenarios(metrics, scenarios: pd.DataFrame) -> ScenarioResult:
+    """Price every scenario in every city at once.
+
+    ``scenarios`` has a ``Budget`` column, one column per item with the
+    monthly quantity and optionally a ``Scenario`` name. The basket cost
+    of all scenarios in all cities is a single (scenario x item) @
+    (item x city) product; surplus is budget minus cost and fit is
+    surplus >= 0. Each field of the result is a scenario x city frame.
+    A Budget or quantity cell that is not a number (or a blank Budget)
+    raises ValueError instead of being read as 0.
+    """
+    if 'Budget' not in scenarios.columns:
+        raise KeyError("Scenarios need a 'Budget' column")
+    budget = _numeric(scenarios[['Budget']], 'budget')['Budget']
+    if budget.isna().any():
+        raise ValueError(f"Missing Budget in row {budget.isna().idxmax()}")
+    q = quantity_matrix(metrics, scenarios)
+    prices = np.nan_to_num(metrics.prices)
+    cost = q @ prices.T
+    surplus = budget.to_numpy(dtype=np.float64)[:, None] - cost
+
+    index = scenarios['Scenario'] if 'Scenario' in scenarios.columns else pd.RangeIndex(len(scenarios), name='Scenario')
+    columns = pd.Index(metrics.city, name='City')
+    return ScenarioResult(
+        pd.DataFrame(cost, index=index, columns=columns),
+        pd.DataFrame(surplus, index=index, columns=columns),
+        pd.DataFrame(surplus >= 0, index=index, columns=columns),
+    )
+
+
+def scenario_template(metrics) -> pd.DataFrame:
+    """Empty scenario sheet with every column the evaluator understands."""
+    return pd.DataFrame(columns=['Scenario', 'Budget'] + metrics.items)
+
+
+if __name__ == "__main__":
+    # python scenarios.py profiles.csv [out_prefix] -> <out_prefix>_fit.csv / _surplus.csv
+    import sys
+
+    from city_metrics import load_city_metrics
+
+    metrics = load_city_metrics()
+    result = evaluate_scenarios(metrics, pd.read_csv(sys.argv[1]))
+    prefix = sys.argv[2] if len(sys.argv) > 2 else 'scenarios'
+    result.fit.to_csv(f"{prefix}_fit.csv")
+    result.surplus.to_csv(f"{prefix}_surplus.csv")
+    print(f"{len(result.fit)} scenarios x {result.fit.shape[1]} cities -> {prefix}_fit.csv, {prefix}_surplus.csv")
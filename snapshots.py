@@ -0,0 +1,242 @@
+"""Every ingested version of the city x item price matrix, over time.
+
+A store is a directory (``<csv>.snapshots/`` by default) holding
+``catalog.json`` (snapshot times, versions, the city and item
+dictionaries) and one compressed .npz segment per snapshot. A segment
+stores only the cells that changed since the previous snapshot, as
+sorted ``item << 32 | city`` keys (delta-encoded, so they compress to
+almost nothing) plus their new values; a cell that disappears is stored
+as NaN. Every KEYFRAME_EVERY-th segment holds the full matrix, so any
+snapshot is rebuilt from at most that many segments, and only a small
+LRU of decoded segments is kept in memory.
+
+    python snapshots.py ingest cost_of_living_indian_cities-checkpoint.csv --at 2025-06-01
+    python snapshots.py ingest cost_of_living_indian_cities.csv
+    python snapshots.py trend Pune "Apartment (1 bedroom) in City Centre" --last 24
+    python snapshots.py inflation --k 10
+"""
+import argparse
+import json
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from cost_data import DATA_FILE, read_price_version
+
+
+KEYFRAME_EVERY = 12
+CITY_BITS = 32
+
+
+def snapshot_dir(path: str = DATA_FILE) -> str:
+    """Default store location for a data file."""
+    return os.path.splitext(path)[0] + '.snapshots'
+
+
+@lru_cache(maxsize=64)
+def _segment(path: str):
+    """(sorted keys, values) of one segment file; segments never change once written."""
+    with np.load(path, allow_pickle=False) as npz:
+        return np.cumsum(npz['key_delta']).astype(np.int64), npz['values']
+
+
+class SnapshotStore:
+    """Append-only, delta-encoded history of one dataset."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._load_catalog()
+
+    def _load_catalog(self):
+        try:
+            with open(os.path.join(self.root, 'catalog.json'), encoding='utf-8') as fh:
+                catalog = json.load(fh)
+        except FileNotFoundError:
+            catalog = {'cities': [], 'items': [], 'snapshots': []}
+        self.cities, self.items, self.snapshots = catalog['cities'], catalog['items'], catalog['snapshots']
+        self._city_id = {name: i for i, name in enumerate(self.cities)}
+        self._item_id = {name: j for j, name in enumerate(self.items)}
+
+    def _save_catalog(self):
+        tmp = os.path.join(self.root, 'catalog.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump({'cities': self.cities, 'items': self.items, 'snapshots': self.snapshots}, fh, ensure_ascii=False)
+        os.replace(tmp, os.path.join(self.root, 'catalog.json'))
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def catalog(self) -> pd.DataFrame:
+        """One row per snapshot: id, time, dataset version, source file, keyframe flag, cells stored."""
+        return pd.DataFrame(self.snapshots, columns=['id', 'taken_at', 'version', 'source', 'keyframe', 'cells'])
+
+    # -------------------- Writing --------------------
+    def _ids(self, names, ids, book) -> np.ndarray:
+        for name in names:
+            if name not in ids:
+                ids[name] = len(book)
+                book.append(name)
+        return np.array([ids[name] for name in names], dtype=np.int64)
+
+    def append(self, table: pd.DataFrame, version: str, taken_at=None, source: str = None) -> bool:
+        """Store ``table`` (City + float item columns) as the newest snapshot.
+
+        Returns False, storing nothing, when ``version`` is already the newest one.
+        """
+        with self._lock:
+            self._load_catalog()
+            if self.snapshots and self.snapshots[-1]['version'] == version:
+                return False
+            items = [col for col in table.columns if col != 'City']
+            rows = self._ids(table['City'].astype(str), self._city_id, self.cities)
+            cols = self._ids(items, self._item_id, self.items)
+            current = np.full((len(self.cities), len(self.items)), np.nan)
+            current[np.ix_(rows, cols)] = table[items].to_numpy(dtype=np.float64)
+
+            snap_id = len(self.snapshots)
+            keyframe = snap_id % KEYFRAME_EVERY == 0
+            if keyframe:
+                mask = ~np.isnan(current)
+            else:
+                previous = self._matrix(snap_id - 1, current.shape)
+                # NaN != NaN, so compare "both missing" explicitly
+                mask = (current != previous) & ~(np.isnan(current) & np.isnan(previous))
+            city, item = np.nonzero(mask.T)[::-1]
+            keys = (item.astype(np.int64) << CITY_BITS) | city
+
+            os.makedirs(self.root, exist_ok=True)
+            name = f"{snap_id:06d}.npz"
+            np.savez_compressed(os.path.join(self.root, name),
+                                key_delta=np.diff(keys, prepend=0), values=current[city, item])
+            taken_at = pd.Timestamp(taken_at) if taken_at is not None else pd.Timestamp.now()
+            self.snapshots.append({'id': snap_id, 'taken_at': taken_at.isoformat(), 'version': version,
+                                   'source': source, 'keyframe': keyframe, 'cells': int(len(keys))})
+            self._save_catalog()
+            return True
+
+    # -------------------- Reading --------------------
+    def _path(self, snap_id: int) -> str:
+        return os.path.join(self.root, f"{snap_id:06d}.npz")
+
+    def _keyframe(self, snap_id: int) -> int:
+        return snap_id - snap_id % KEYFRAME_EVERY
+
+    def _matrix(self, snap_id: int, shape=None) -> np.ndarray:
+        """Dense cities x items matrix as of ``snap_id`` (NaN where a city or item was absent)."""
+        shape = shape or (len(self.cities), len(self.items))
+        matrix = np.full(shape, np.nan)
+        for k in range(self._keyframe(snap_id), snap_id + 1):
+            keys, values = _segment(self._path(k))
+            matrix[keys & ((1 << CITY_BITS) - 1), keys >> CITY_BITS] = values
+        return matrix
+
+    def _select(self, since=None, until=None, last: int = None) -> list:
+        ids = [s['id'] for s in self.snapshots
+               if (since is None or pd.Timestamp(s['taken_at']) >= pd.Timestamp(since))
+               and (until is None or pd.Timestamp(s['taken_at']) <= pd.Timestamp(until))]
+        return ids[-last:] if last else ids
+
+    def frame(self, snap_id: int = -1) -> pd.DataFrame:
+        """City + item prices as of one snapshot (cities absent from it are left out)."""
+        snap_id = self.snapshots[snap_id]['id']
+        matrix = self._matrix(snap_id)
+        present = ~np.isnan(matrix).all(axis=1)
+        df = pd.DataFrame(matrix[present], columns=self.items)
+        df.insert(0, 'City', np.asarray(self.cities, dtype=object)[present])
+        return df
+
+    def trend(self, city: str, item: str, since=None, until=None, last: int = None) -> pd.Series:
+        """Price of one city/item at every selected snapshot, indexed by snapshot time.
+
+        Only the requested key is looked up in each segment (a binary
+        search), starting from the keyframe before the first selected
+        snapshot, so the cost grows with the number of snapshots, not
+        with the size of the matrix.
+        """
+        ids = self._select(since, until, last)
+        if city not in self._city_id or item not in self._item_id or not ids:
+            return pd.Series([], dtype=np.float64, name=item)
+        key = (self._item_id[item] << CITY_BITS) | self._city_id[city]
+        value, out = np.nan, {}
+        wanted = set(ids)
+        for k in range(self._keyframe(ids[0]), ids[-1] + 1):
+            keys, values = _segment(self._path(k))
+            pos = np.searchsorted(keys, key)
+            if pos < len(keys) and keys[pos] == key:
+                value = values[pos]
+            elif self.snapshots[k]['keyframe']:
+                value = np.nan
+            if k in wanted:
+                out[pd.Timestamp(self.snapshots[k]['taken_at'])] = value
+        return pd.Series(out, name=item, dtype=np.float64)
+
+    def inflation(self, since=None, until=None, k: int = 10) -> pd.DataFrame:
+        """Items whose median price change across cities was largest between two snapshots."""
+        ids = self._select(since, until)
+        if len(ids) < 2:
+            return pd.DataFrame(columns=['Item', 'Change (%)', 'Cities'])
+        first, latest = self._matrix(ids[0]), self._matrix(ids[-1])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.where((first > 0) & (latest > 0), (latest / first - 1) * 100, np.nan)
+        counted = (~np.isnan(change)).sum(axis=0)
+        keep = counted > 0
+        result = pd.DataFrame({
+            'Item': np.asarray(self.items, dtype=object)[keep],
+            'Change (%)': np.nanmedian(change[:, keep], axis=0),
+            'Cities': counted[keep],
+        })
+        return result.nlargest(k, 'Change (%)').reset_index(drop=True)
+
+
+# root -> SnapshotStore, so every session shares one catalog
+_stores = {}
+_lock = threading.Lock()
+
+
+def load_store(path: str = DATA_FILE) -> SnapshotStore:
+    """Shared store for a data file."""
+    root = os.path.abspath(snapshot_dir(path))
+    with _lock:
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = SnapshotStore(root)
+    return store
+
+
+def record_snapshot(model, path: str = DATA_FILE):
+    """Watcher listener: keep every version the dashboard loads (see refresh.start_watcher)."""
+    try:
+        load_store(path).append(model.price_frame(model.items), model.version, source=os.path.basename(path))
+    except OSError:
+        # Read-only deployments keep working, they just do not record history
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--store', default=DATA_FILE, help="data file whose store to use")
+    sub = parser.add_subparsers(dest='command', required=True)
+    ingest = sub.add_parser('ingest', help="add a CSV (wide or long) as the newest snapshot")
+    ingest.add_argument('csv')
+    ingest.add_argument('--at', help="snapshot time (default: now)")
+    trend = sub.add_parser('trend', help="one city/item over time")
+    trend.add_argument('city')
+    trend.add_argument('item')
+    trend.add_argument('--last', type=int)
+    inflation = sub.add_parser('inflation', help="items with the largest price rise")
+    inflation.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    store = load_store(args.store)
+    if args.command == 'ingest':
+        digest, table, _ = read_price_version(args.csv)
+        added = store.append(table, digest, args.at, os.path.basename(args.csv))
+        print(f"{'stored' if added else 'unchanged'}: {len(store)} snapshots in {store.root}")
+    elif args.command == 'trend':
+        print(store.trend(args.city, args.item, last=args.last).to_string())
+    else:
+        print(store.inflation(k=args.k).to_string(index=False))
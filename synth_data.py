@@ -0,0 +1,120 @@
+"""Synthetic cost-of-living datasets for load and scale testing.
+
+Produces files with exactly the schema of cost_of_living_indian_cities.csv
+(wide: City + 54 items, "1,500,000.00\xa0₹" formatting, plain number for the
+mortgage-rate column) or of the checkpoint file (long: City,Category,Price,
+with the plain space before ₹ that the scraper writes there).
+Prices are drawn from a multivariate log-normal fitted to the real file, so
+items that move together across real cities (rents, salaries, car prices)
+move together here too. Rows are generated and written in chunks, so
+output size is bounded by disk, not memory:
+
+    python synth_data.py out.csv --cities 1000000 --missing 0.02 --seed 7
+    python synth_data.py out_long.csv --layout long --cities 200000
+    python synth_data.py out.csv --template other_prices.csv
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from cost_data import DATA_FILE
+from price_parser import parse_prices
+
+
+CHUNK_CITIES = 50_000
+# The real file the model is fitted to, found next to this module whatever the working directory
+TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), DATA_FILE)
+# What separates an amount from "₹" in each layout's real file
+CURRENCY_SEP = {'wide': '\xa0', 'long': ' '}
+# Pull the sample covariance towards its diagonal: 18 real cities cannot pin down 54x54 correlations
+SHRINKAGE = 0.3
+
+
+class PriceModel:
+    """Log-normal price model (mean + shrunk covariance of log prices) fitted to a real file."""
+
+    def __init__(self, template: str = TEMPLATE, columns=None):
+        raw = pd.read_csv(template)
+        parsed = parse_prices(raw)
+        self.columns = list(columns) if columns is not None else parsed.columns
+        self.units = [parsed.units[col] for col in self.columns]
+        values = pd.DataFrame(parsed.values, columns=parsed.columns)[self.columns].to_numpy()
+        logs = np.log(np.where(values > 0, values, np.nan))
+        self.mean = np.nanmean(logs, axis=0)
+        filled = np.where(np.isnan(logs), self.mean, logs)
+        sample = np.atleast_2d(np.cov(filled, rowvar=False))
+        self.cov = (1 - SHRINKAGE) * sample + SHRINKAGE * np.diag(np.diag(sample))
+        self.city_names = raw['City'].astype(str).tolist()
+
+    def sample(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """``n`` x items matrix of prices."""
+        return np.exp(rng.multivariate_normal(self.mean, self.cov, size=n, method='cholesky'))
+
+
+def _format(values: np.ndarray, unit: str, missing: np.ndarray, sep: str = CURRENCY_SEP['wide']) -> np.ndarray:
+    if unit == 'INR':
+        text = [f"{v:,.2f}{sep}₹" for v in values]
+    else:
+        text = [f"{v:.2f}" for v in values]
+    out = np.array(text, dtype=object)
+    out[missing] = None
+    return out
+
+
+def generate_chunks(n_cities: int, seed: int = 0, missing_rate: float = 0.0, model: PriceModel = None,
+                    chunk_cities: int = CHUNK_CITIES, layout: str = 'wide'):
+    """Yield wide raw frames (``layout``'s CSV formatting) of at most ``chunk_cities`` rows, ``n_cities`` in total."""
+    model = model or PriceModel()
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_cities, chunk_cities):
+        n = min(chunk_cities, n_cities - start)
+        prices = model.sample(n, rng)
+        missing = rng.random(prices.shape) < missing_rate
+        base = np.asarray(model.city_names, dtype=object)[rng.integers(0, len(model.city_names), n)]
+        chunk = pd.DataFrame({
+            col: _format(prices[:, j], model.units[j], missing[:, j], CURRENCY_SEP[layout])
+            for j, col in enumerate(model.columns)
+        })
+        chunk.insert(0, 'City', [f"{name} {start + i + 1}" for i, name in enumerate(base)])
+        yield chunk
+
+
+def generate_frame(n_cities: int, seed: int = 0, missing_rate: float = 0.0, columns=None) -> pd.DataFrame:
+    """Whole synthetic wide frame in memory (for tests and benchmarks of modest size)."""
+    model = PriceModel(columns=columns)
+    return pd.concat(list(generate_chunks(n_cities, seed, missing_rate, model)), ignore_index=True)
+
+
+def to_long(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Wide chunk -> City,Category,Price rows (missing prices are dropped, as the scraper does)."""
+    long = chunk.melt(id_vars='City', var_name='Category', value_name='Price')
+    return long.dropna(subset=['Price'])
+
+
+def write_dataset(path: str, n_cities: int, layout: str = 'wide', seed: int = 0, missing_rate: float = 0.0,
+                  template: str = TEMPLATE) -> int:
+    """Stream a synthetic dataset to ``path``; returns the number of data rows written."""
+    rows = 0
+    model = PriceModel(template)
+    for k, chunk in enumerate(generate_chunks(n_cities, seed, missing_rate, model, layout=layout)):
+        if layout == 'long':
+            chunk = to_long(chunk)
+        chunk.to_csv(path, mode='w' if k == 0 else 'a', header=(k == 0), index=False)
+        rows += len(chunk)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path')
+    parser.add_argument('--cities', type=int, default=1000)
+    parser.add_argument('--layout', choices=['wide', 'long'], default='wide')
+    parser.add_argument('--missing', type=float, default=0.0, help="fraction of prices left empty")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--template', default=TEMPLATE, help="wide CSV the price model is fitted to")
+    args = parser.parse_args()
+
+    written = write_dataset(args.path, args.cities, args.layout, args.seed, args.missing, args.template)
+    print(f"wrote {written:,} rows to {args.path}")
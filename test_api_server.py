@@ -0,0 +1,125 @@
+import json
+import os
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+
+import numpy as np
+import pytest
+
+import api_server
+from city_metrics import load_city_metrics
+from conftest import make_raw, write_csv
+from recommend import recommend
+
+
+def make_get(data_file):
+    server = api_server.serve_in_background(data_file=data_file)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def get(path):
+        try:
+            with urllib.request.urlopen(base + path, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+    return server, get
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    data_file = write_csv(tmp_path_factory.mktemp('api') / "prices.csv", make_raw())
+    server, get = make_get(data_file)
+    yield get, load_city_metrics(data_file)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def get(server):
+    return server[0]
+
+
+@pytest.fixture
+def metrics(server):
+    return server[1]
+
+
+def test_lookups(get, metrics):
+    status, cities = get('/cities')
+    assert status == 200 and cities == metrics.city.tolist()
+
+    status, row = get(f"/city?name={quote(metrics.city[2])}")
+    assert status == 200 and row['City'] == metrics.city[2]
+    assert row['Total Cost'] == pytest.approx(metrics.metric('Total Cost')[2])
+
+    status, rows = get(f"/compare?city={quote(metrics.city[3])}&city={quote(metrics.city[1])}")
+    assert [r['City'] for r in rows] == [metrics.city[3], metrics.city[1]]
+
+    status, ranked = get('/ranking?k=3')
+    assert status == 200 and [r['City'] for r in ranked] == recommend(metrics, k=3)['City'].tolist()
+
+    status, fit = get('/budget-fit?budget=3000')
+    assert {r['City'] for r in fit} == set(metrics.city[metrics.metric('Total Cost') <= 3000])
+
+    item = metrics.items[2]
+    status, basket = get(f"/basket?item={quote(item)}&qty=2")
+    assert basket[0]['Basket Cost'] == pytest.approx(2 * np.nan_to_num(metrics.price(item)).min())
+
+    status, top = get('/top?column=Rent&k=2&order=asc')
+    assert [r['Rent'] for r in top] == sorted(metrics.metric('Rent'))[:2]
+
+    status, ranks = get(f"/rank?city={quote(metrics.city[0])}&column=Rent")
+    assert status == 200 and ranks[0]['Column'] == 'Rent'
+
+    status, regions = get('/regions?column=Rent&stat=max')
+    assert status == 200 and regions[0]['Rank'] == 1
+    status, west = get('/region?name=West&column=Rent')
+    assert status == 200 and west['Stats'][0]['Column'] == 'Rent'
+
+
+@pytest.mark.parametrize('path, status', [
+    ('/nope', 404),
+    ('/city', 400),
+    ('/city?name=Nowhere', 404),
+    ('/ranking?k=0', 400),
+    ('/ranking?k=x', 400),
+    ('/budget-fit', 400),
+    ('/budget-fit?budget=lots', 400),
+    ('/basket', 400),
+    ('/basket?item=Caviar&qty=1', 404),
+    ('/basket?item=Caviar', 400),
+    ('/top?column=Nope', 404),
+    ('/rank?city=Nowhere', 404),
+    ('/regions?column=Rent&stat=mode', 400),
+    ('/region?name=Atlantis', 404),
+])
+def test_bad_requests(get, path, status):
+    got, body = get(path)
+    assert got == status and 'error' in body
+
+
+def test_unavailable_data_is_503_until_the_file_is_back(tmp_path, raw):
+    data_file = str(tmp_path / "later.csv")
+    server, get = make_get(data_file)
+    try:
+        assert get('/cities')[0] == 503
+        with open(data_file, 'w') as fh:
+            fh.write("City,Rent\nPune,1\n")  # required columns missing
+        assert get('/cities')[0] == 503
+        write_csv(data_file, raw)
+        status, cities = get('/cities')
+        assert status == 200 and len(cities) == len(raw)
+        os.remove(data_file)
+        assert get('/cities')[0] == 503
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unexpected_errors_are_500(get, monkeypatch):
+    def broken(metrics, query):
+        raise RuntimeError("boom")
+    monkeypatch.setitem(api_server.ROUTES, '/broken', broken)
+    status, body = get('/broken')
+    assert status == 500 and body == {'error': 'Internal error: RuntimeError'}
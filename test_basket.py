@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from basket import BasketCalculator, session_basket, zeroed_prices
+from city_metrics import load_city_metrics
+from conftest import edit_prices, write_csv
+from cost_data import seed_baseline
+
+
+def test_incremental_totals_equal_a_full_product(metrics):
+    calc = BasketCalculator(metrics, {metrics.items[0]: 2.0})
+    rng = np.random.default_rng(0)
+    prices = np.nan_to_num(metrics.prices)
+    for _ in range(300):
+        calc.set_quantity(metrics.items[rng.integers(len(metrics.items))], float(rng.integers(0, 6)) / 2)
+        np.testing.assert_allclose(calc.totals, prices @ calc.quantities, rtol=1e-9, atol=1e-6)
+    calc.update(dict(zip(metrics.items, np.arange(len(metrics.items), dtype=float))))
+    np.testing.assert_allclose(calc.totals, prices @ np.arange(len(metrics.items)), rtol=1e-9)
+
+
+def test_rebuild_keeps_totals_exact(metrics):
+    calc = BasketCalculator(metrics)
+    calc.REBUILD_EVERY = 5
+    for k in range(10):
+        calc.set_quantity(metrics.items[k], 1.0)
+    # The 10th update rebuilt the totals from scratch
+    np.testing.assert_array_equal(calc.totals, np.nan_to_num(metrics.prices) @ calc.quantities)
+
+
+def test_lookups(metrics):
+    calc = BasketCalculator(metrics, {metrics.items[1]: 3.0, metrics.items[4]: 1.0})
+    city = metrics.city[6]
+    prices = np.nan_to_num(metrics.prices)
+    assert calc.total(city) == prices[6, 1] * 3 + prices[6, 4]
+    assert np.isnan(calc.total('Nowhere'))
+    breakdown = calc.breakdown(city)
+    assert breakdown['Item'].tolist() == [metrics.items[1], metrics.items[4]]
+    assert breakdown['Cost'].sum() == calc.total(city)
+    ranking = calc.ranking()
+    assert (np.diff(ranking['Basket Cost']) >= 0).all()
+    pd.testing.assert_frame_equal(calc.ranking(k=5), ranking.head(5))
+    frame = calc.quantity_frame()
+    frame.loc[1, 'Quantity'] = 99
+    assert calc.quantities[1] == 3.0
+
+
+def test_sessions_share_one_price_matrix(metrics):
+    a, b = BasketCalculator(metrics), BasketCalculator(metrics)
+    assert a._prices is b._prices is zeroed_prices(metrics)
+    assert not a._prices.flags.writeable
+
+
+def test_session_basket_follows_a_patched_dataset(data_file, raw):
+    seed_baseline(data_file)
+    state = {}
+    before = load_city_metrics(data_file)
+    calc = session_basket(state, before, {'Apartment (1 bedroom) in City Centre': 1.0, 'Unknown item': 5.0})
+    calc.set_quantity('Average Monthly Net Salary (After Tax)', 0.5)
+    assert session_basket(state, before) is calc
+
+    write_csv(data_file, edit_prices(raw, [3, 8]))
+    after = load_city_metrics(data_file)
+    assert session_basket(state, after) is calc  # refreshed in place
+    np.testing.assert_allclose(calc.totals, np.nan_to_num(after.prices) @ calc.quantities)
+
+    write_csv(data_file, raw.iloc[::-1])
+    reordered = load_city_metrics(data_file)
+    rebuilt = session_basket(state, reordered)
+    assert rebuilt is not calc and rebuilt.quantities.tolist() == calc.quantities.tolist()
+    np.testing.assert_allclose(rebuilt.totals, np.nan_to_num(reordered.prices) @ rebuilt.quantities)
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from city_metrics import METRIC_COLUMNS, CityMetrics, load_city_metrics
+from conftest import edit_prices, write_csv
+from cost_data import derive_metrics, read_delta, read_price_table, read_price_version, seed_baseline
+
+
+def full_model(path) -> CityMetrics:
+    table, _ = read_price_table(path)
+    return CityMetrics.from_frame(table)
+
+
+def assert_same_model(a: CityMetrics, b: CityMetrics):
+    assert a.city.tolist() == b.city.tolist()
+    assert a.items == b.items
+    np.testing.assert_array_equal(a.prices, b.prices)
+    np.testing.assert_array_equal(a.values, b.values)
+    assert a.region.tolist() == b.region.tolist()
+
+
+def test_metrics_match_the_legacy_derived_frame(data_file):
+    model = full_model(data_file)
+    table, _ = read_price_table(data_file)
+    legacy = derive_metrics(table)
+    for name in ['Salary', 'Rent', 'Groceries', 'Total Cost']:
+        np.testing.assert_allclose(model.metric(name), legacy[name])
+    # Here the index is Salary / Total Cost (higher = more affordable)
+    np.testing.assert_allclose(model.metric('Affordability Index'), legacy['Salary'] / legacy['Total Cost'])
+    assert not model.prices.flags.writeable and not model.values.flags.writeable
+
+
+def test_lookups(metrics):
+    cities = [metrics.city[5], 'Nowhere', metrics.city[2]]
+    np.testing.assert_array_equal(metrics.positions(cities), [5, 2])
+    frame = metrics.frame(cities)
+    assert frame.columns.tolist() == ['City', 'Region'] + METRIC_COLUMNS
+    assert frame['City'].tolist() == [metrics.city[5], metrics.city[2]]
+    prices = metrics.price_frame(metrics.items[:2], cities)
+    np.testing.assert_array_equal(prices[metrics.items[1]], metrics.price(metrics.items[1])[[5, 2]])
+
+
+def test_repeated_city_resolves_to_its_last_row(raw):
+    raw.loc[9, 'City'] = raw.loc[3, 'City']
+    table = raw[['City']].assign(**{col: np.arange(len(raw), dtype=float) for col in raw.columns[1:]})
+    model = CityMetrics.from_frame(table)
+    np.testing.assert_array_equal(model.positions([raw.loc[3, 'City']]), [9])
+
+
+def test_patched_equals_full_reload(data_file, raw):
+    digest, table, _ = read_price_version(data_file)  # also records the row baseline
+    before = CityMetrics.from_frame(table, digest)
+    edited = edit_prices(raw, [0, 4, 30])
+    edited = pd.concat([edited.drop(index=[12]), raw.iloc[[6]].assign(City='Newtown')], ignore_index=True)
+    write_csv(data_file, edited)
+
+    delta = read_delta(data_file, digest)
+    patched = before.patched(delta)
+    assert_same_model(patched, full_model(data_file))
+    assert patched.version == delta.digest and patched.parent_version == digest
+    assert patched.changed == {raw.loc[0, 'City'], raw.loc[4, 'City'], raw.loc[30, 'City'],
+                               raw.loc[12, 'City'], 'Newtown'}
+    assert not patched.same_rows
+
+
+def test_load_city_metrics_patches_a_changed_file(data_file, raw):
+    seed_baseline(data_file)
+    first = load_city_metrics(data_file)
+    assert load_city_metrics(data_file) is first
+
+    write_csv(data_file, edit_prices(raw, [1, 7]))
+    second = load_city_metrics(data_file)
+    assert second.parent_version == first.version
+    assert second.changed == {raw.loc[1, 'City'], raw.loc[7, 'City']}
+    assert second.same_rows
+    assert_same_model(second, full_model(data_file))
+
+    moved = pd.concat([raw.iloc[1:], raw.iloc[:1]], ignore_index=True)
+    write_csv(data_file, moved)
+    third = load_city_metrics(data_file)
+    assert not third.same_rows
+    assert_same_model(third, full_model(data_file))
+
+
+def test_compact_mode_keeps_float32_prices(data_file, monkeypatch):
+    monkeypatch.setenv('DASHBOARD_COMPACT', '1')
+    model = load_city_metrics(data_file)
+    assert model.prices.dtype == np.float32
+    np.testing.assert_allclose(model.prices, full_model(data_file).prices, rtol=1e-6)
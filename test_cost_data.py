@@ -0,0 +1,132 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cost_data
+from conftest import edit_prices, write_csv
+from cost_data import (derive_metrics, file_signature, load_city_data, load_price_table, read_delta,
+                       read_price_table, read_price_version, read_sidecar, seed_baseline, sidecar_path, write_sidecar)
+from synth_data import to_long
+
+
+def sha1_of(path):
+    with open(path, 'rb') as fh:
+        return hashlib.sha1(fh.read()).hexdigest()
+
+
+# -------------------- File versions --------------------
+def test_signature_is_the_content_hash_and_kept_once_per_file(data_file, raw):
+    digest = file_signature(data_file)[2]
+    assert digest == sha1_of(data_file)
+    entries = len(cost_data._digests)
+    for _ in range(3):
+        write_csv(data_file, raw)  # same bytes, new mtime
+        assert file_signature(data_file)[2] == digest
+    write_csv(data_file, edit_prices(raw, [0]))
+    assert file_signature(data_file)[2] == sha1_of(data_file) != digest
+    # A touched or rewritten file replaces its entry instead of adding one
+    assert len(cost_data._digests) == entries
+
+
+def test_load_city_data_is_cached_per_version(data_file, raw):
+    first = load_city_data(data_file)
+    table, _ = read_price_table(data_file)
+    pd.testing.assert_frame_equal(first, derive_metrics(table))
+    write_csv(data_file, edit_prices(raw, [2]))
+    changed = load_city_data(data_file)
+    assert changed.loc[2, 'Rent'] != first.loc[2, 'Rent']
+
+
+# -------------------- Sidecar --------------------
+def test_sidecar_round_trip_and_staleness(data_file, raw):
+    digest, table = load_price_table(data_file)
+    assert digest == sha1_of(data_file)
+    assert os.path.exists(sidecar_path(data_file))
+    pd.testing.assert_frame_equal(read_sidecar(data_file, digest), table)
+    pd.testing.assert_frame_equal(table, read_price_table(data_file)[0])
+
+    write_csv(data_file, edit_prices(raw, [1]))
+    assert read_sidecar(data_file) is None
+    digest2, table2 = load_price_table(data_file)
+    assert digest2 == sha1_of(data_file)
+    pd.testing.assert_frame_equal(read_sidecar(data_file, digest2), table2)
+
+
+def test_sidecar_is_tagged_with_the_parsed_bytes(data_file, raw):
+    digest, table, _ = read_price_version(data_file)
+    write_csv(data_file, edit_prices(raw, [0]))
+    # Tagged with the version the table came from, not the file as it is now
+    write_sidecar(data_file, table, digest)
+    assert read_sidecar(data_file) is None
+    pd.testing.assert_frame_equal(read_sidecar(data_file, digest), table)
+    with pytest.raises(ValueError):
+        write_sidecar(data_file, table)
+
+
+# -------------------- Long format --------------------
+def test_long_file_parses_to_the_wide_table(tmp_path, data_file, raw):
+    long_file = tmp_path / "prices_long.csv"
+    to_long(raw).to_csv(long_file, index=False)
+    wide, _ = read_price_table(data_file)
+    digest, table, errors = read_price_version(str(long_file))
+    assert digest == sha1_of(long_file)
+    assert errors.empty
+    table = table.set_index('City').reindex(index=wide['City'], columns=wide.columns[1:])
+    np.testing.assert_array_equal(table.to_numpy(), wide.drop(columns='City').to_numpy())
+
+
+def test_long_file_errors_name_the_file_row_and_city(tmp_path):
+    long_file = tmp_path / "long.csv"
+    long_file.write_text("City,Category,Price\n"
+                         "Pune,Rent,\"10,000.00 ₹\"\n"
+                         ",Rent,5 ₹\n"
+                         "Pune,Milk,cheap\n"
+                         "Delhi,Rent,12 ₹\n", encoding='utf-8')
+    table, errors = read_price_table(str(long_file))
+    assert table['City'].tolist() == ['Pune', 'Delhi']
+    assert table.loc[0, 'Rent'] == 10_000 and np.isnan(table.loc[0, 'Milk'])
+    assert errors.to_dict('records') == [{'row': 2, 'City': 'Pune', 'column': 'Milk', 'value': 'cheap'}]
+
+
+def test_wide_errors_name_the_city(tmp_path, raw):
+    raw.loc[4, 'Rice (white), (1kg)'] = 'cheap'
+    table, errors = read_price_table(write_csv(tmp_path / "bad.csv", raw))
+    assert errors[['row', 'City', 'column', 'value']].values.tolist() == [[4, raw.loc[4, 'City'], 'Rice (white), (1kg)', 'cheap']]
+    assert np.isnan(table.loc[4, 'Rice (white), (1kg)'])
+
+
+# -------------------- Row deltas --------------------
+def test_delta_holds_only_changed_added_and_removed_rows(data_file, raw):
+    seed_baseline(data_file)
+    since = file_signature(data_file)[2]
+    edited = edit_prices(raw, [3, 10])
+    added = raw.iloc[[5]].assign(City='Newtown')
+    edited = pd.concat([edited.drop(index=7), added], ignore_index=True)
+    write_csv(data_file, edited)
+
+    delta = read_delta(data_file, since)
+    assert delta.digest == sha1_of(data_file)
+    assert delta.city.tolist() == edited['City'].tolist()
+    assert sorted(delta.changed['City']) == sorted([raw.loc[3, 'City'], raw.loc[10, 'City'], 'Newtown'])
+    assert delta.removed == [raw.loc[7, 'City']]
+    full, _ = read_price_table(data_file)
+    expected = full.set_index('City').loc[delta.changed['City']].reset_index()
+    pd.testing.assert_frame_equal(delta.changed.reset_index(drop=True), expected)
+
+
+def test_delta_needs_a_full_reload_when_lines_cannot_be_matched(data_file, raw):
+    seed_baseline(data_file)
+    since = file_signature(data_file)[2]
+    assert read_delta(data_file, 'some other version') is None
+    write_csv(data_file, raw.rename(columns={'Gasoline (1 liter)': 'Petrol (1 liter)'}))
+    assert read_delta(data_file, since) is None
+
+
+def test_an_emptied_file_is_a_full_reload(data_file):
+    seed_baseline(data_file)
+    since = file_signature(data_file)[2]
+    open(data_file, 'w').close()  # caught between truncate and write
+    assert read_delta(data_file, since) is None
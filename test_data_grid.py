@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from city_metrics import METRIC_COLUMNS
+from data_grid import BLUES, GridSource, metrics_source, share_source
+
+
+def test_rows_match_pandas_filter_and_sort(metrics):
+    source = metrics_source(metrics)
+    assert metrics_source(metrics) is source
+    table = metrics.table()
+    low, high = np.nanpercentile(table['Rent'], [20, 80])
+    cities = list(metrics.city[::3])
+    rows = source.rows('Total Cost', True, search='a', cities=cities, value_range=('Rent', low, high))
+    keep = (table['City'].str.lower().str.contains('a') & table['City'].isin(cities)
+            & table['Rent'].between(low, high))
+    expected = table[keep].sort_values('Total Cost', ascending=False, kind='stable', na_position='last')
+    assert metrics.city[rows].tolist() == expected['City'].tolist()
+
+    by_city = source.rows('City')
+    assert metrics.city[by_city].tolist() == sorted(metrics.city)
+
+
+def test_window_projects_one_page(metrics):
+    source = metrics_source(metrics)
+    rows = source.rows('Salary')
+    df, visible = source.window(rows, ['Salary', 'Unknown', metrics.items[0]], page=1, page_size=7)
+    assert df.columns.tolist() == ['City', 'Salary', metrics.items[0]]
+    np.testing.assert_array_equal(visible, rows[7:14])
+    np.testing.assert_array_equal(df['Salary'], metrics.metric('Salary')[rows[7:14]])
+
+
+def test_unranked_columns_sort_with_missing_values_last():
+    values = np.array([3.0, np.nan, 1.0, 2.0, np.nan])
+    source = GridSource(['a', 'b', 'c', 'd', 'e'], {'x': values})
+    np.testing.assert_array_equal(source.sorted_rows('x'), [2, 3, 0, 1, 4])
+    np.testing.assert_array_equal(source.sorted_rows('x', descending=True), [0, 3, 2, 1, 4])
+    np.testing.assert_array_equal(source.buckets('x'), [len(BLUES) - 1, -1, 0, len(BLUES) // 2, -1])
+
+
+def test_share_source(metrics):
+    items = metrics.items[:3]
+    source = share_source(metrics, items)
+    prices = np.nan_to_num(metrics.price_frame(items)[items].to_numpy())
+    np.testing.assert_allclose(source.columns['Total'], prices.sum(axis=1))
+    shares = pd.DataFrame({item: source.columns[item] for item in items})
+    np.testing.assert_allclose(shares.sum(axis=1), 100)
+    assert set(metrics_source(metrics).columns) == set(METRIC_COLUMNS) | set(metrics.items)
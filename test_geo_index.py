@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from city_map import CITY_COORDS
+from geo_index import (CityGeoIndex, coordinate_table, haversine_km, load_geo_index, most_affordable_within,
+                       within_budget)
+
+
+def random_points(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lon = rng.uniform(-180, 180, n)
+    # Pile some onto the poles and the antimeridian, where the grid wraps
+    lat[:10], lon[10:20] = rng.choice([-89.9, 89.9], 10), rng.choice([-179.9, 179.9], 10)
+    return lat, lon
+
+
+@pytest.mark.parametrize('cell_deg', [0.5, 1.0, 7.0, 25.0])
+def test_within_matches_brute_force(cell_deg):
+    lat, lon = random_points(3000)
+    index = CityGeoIndex(np.arange(len(lat)), lat, lon, cell_deg)
+    queries = [(0.0, 0.0, 500), (89.5, 10.0, 300), (-89.0, -170.0, 800), (10.0, 179.8, 600),
+               (10.0, -179.8, 600), (45.0, 30.0, 4000), (-30.0, 100.0, 25000)]
+    for qlat, qlon, radius in queries:
+        rows, dist = index.within(qlat, qlon, radius)
+        brute = haversine_km(qlat, qlon, lat, lon)
+        expected = np.flatnonzero(brute <= radius)
+        assert sorted(rows) == sorted(expected)
+        assert (np.diff(dist) >= 0).all()
+        np.testing.assert_allclose(dist, brute[rows])
+
+
+def test_nearest_matches_brute_force():
+    lat, lon = random_points(500, seed=1)
+    index = CityGeoIndex(np.arange(len(lat)), lat, lon)
+    for qlat, qlon in [(20.0, 78.0), (-60.0, 179.0), (88.0, 0.0)]:
+        rows, dist = index.nearest(qlat, qlon, k=7)
+        brute = haversine_km(qlat, qlon, lat, lon)
+        np.testing.assert_allclose(dist, np.sort(brute)[:7])
+    assert len(index.nearest(0.0, 0.0, k=10_000)[0]) == len(lat)
+
+
+def test_most_affordable_within_matches_brute_force(metrics):
+    lat, lon = random_points(len(metrics), seed=2)
+    lat, lon = 8 + (lat + 90) / 180 * 25, 68 + (lon + 180) / 360 * 29  # spread over India
+    coords = pd.DataFrame({'City': metrics.city, 'lat': lat, 'lon': lon})
+    index = CityGeoIndex.from_metrics(metrics, coords)
+    assert len(index) == len(metrics)
+
+    origin = metrics.city[3]
+    for radius in [100, 400, 1500]:
+        got = most_affordable_within(metrics, index, origin, radius, k=5)
+        dist = haversine_km(lat[3], lon[3], lat, lon)
+        score = np.nan_to_num(metrics.metric('Affordability Index'), nan=-np.inf)
+        near = np.flatnonzero(dist <= radius)
+        best = near[np.lexsort((near, -score[near]))][:5]
+        assert sorted(got['City']) == sorted(metrics.city[best])
+        np.testing.assert_allclose(got['Distance (km)'], np.round(dist[metrics.positions(got['City'])], 1))
+        assert (np.diff(metrics.frame(got['City'])['Affordability Index']) <= 0).all()
+
+    budget = float(np.nanmedian(metrics.metric('Total Cost')))
+    cheap = within_budget(metrics, index, (lat[3], lon[3]), 800, budget)
+    dist = haversine_km(lat[3], lon[3], lat, lon)
+    expected = np.flatnonzero((dist <= 800) & (metrics.metric('Total Cost') < budget))
+    assert sorted(cheap['City']) == sorted(metrics.city[expected])
+
+
+def test_origins_resolve_through_the_index_table(metrics):
+    coords = {metrics.city[0]: [20.0, 78.0], 'Mysuru': [12.3, 76.6]}
+    index = CityGeoIndex.from_metrics(metrics, coords)
+    assert index.locate('Mysuru') == (12.3, 76.6)
+    assert len(index) == 1
+    assert most_affordable_within(metrics, index, 'Mysuru', 1000)['City'].tolist() == [metrics.city[0]]
+    with pytest.raises(KeyError):
+        most_affordable_within(metrics, index, metrics.city[1], 1000)
+
+
+def test_coordinate_table_sources(tmp_path):
+    path = tmp_path / "coords.csv"
+    pd.DataFrame({' city ': ['A', 'B', 'B', 'C'], 'Lat': [1, 2, 3, 'x'], 'LNG': [4, 5, 6, 7]}).to_csv(path, index=False)
+    table = coordinate_table(str(path))
+    assert table.index.tolist() == ['A', 'B'] and table.loc['B'].tolist() == [3.0, 6.0]
+    assert len(coordinate_table()) == len(CITY_COORDS)
+    with pytest.raises(ValueError):
+        coordinate_table(pd.DataFrame({'City': ['A'], 'Latitude': [1.0]}))
+
+
+def test_shared_index_follows_the_coordinates_file(metrics, tmp_path):
+    path = tmp_path / "coords.csv"
+    builtin = load_geo_index(metrics, str(path))
+    assert load_geo_index(metrics, str(path)) is builtin
+    pd.DataFrame({'City': [metrics.city[10]], 'Latitude': [20.0], 'Longitude': [78.0]}).to_csv(path, index=False)
+    from_file = load_geo_index(metrics, str(path))
+    assert from_file is not builtin and from_file.rows.tolist() == [10]
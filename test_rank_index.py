@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rank_index import RankIndex, load_rank_index
+
+
+@pytest.fixture
+def table(metrics):
+    return pd.concat([metrics.price_frame(metrics.items), metrics.frame().drop(columns=['City', 'Region'])], axis=1)
+
+
+def test_dense_ranks_and_percentiles_match_pandas(metrics, table):
+    ranks = RankIndex(metrics)
+    for column in ranks.columns:
+        values = table[column]
+        dense = values.rank(method='dense').fillna(0).astype(int)
+        pct = values.rank(method='max') / values.notna().sum() * 100
+        j = ranks.columns.index(column)
+        np.testing.assert_array_equal(ranks.dense[j], dense)
+        np.testing.assert_allclose(ranks.percentile[j], pct, rtol=1e-5, equal_nan=True)
+
+
+def test_sorted_rows_and_top_match_a_full_sort(metrics, table):
+    ranks = RankIndex(metrics)
+    for column in ['Rent', 'Affordability Index', metrics.items[0]]:
+        values = table[column]
+        asc = ranks.sorted_rows(column)
+        desc = ranks.sorted_rows(column, descending=True)
+        present = values.notna().sum()
+        assert (np.diff(values.to_numpy()[asc[:present]]) >= 0).all()
+        assert (np.diff(values.to_numpy()[desc[:present]]) <= 0).all()
+        assert values.iloc[asc[present:]].isna().all() and values.iloc[desc[present:]].isna().all()
+        np.testing.assert_array_equal(values.to_numpy()[ranks.top(column, 5)],
+                                      values.sort_values(ascending=False).to_numpy()[:5])
+        np.testing.assert_array_equal(values.to_numpy()[ranks.top(column, 5, descending=False)],
+                                      values.sort_values().to_numpy()[:5])
+
+
+def test_city_lookups(metrics, table):
+    ranks = load_rank_index(metrics)
+    assert load_rank_index(metrics) is ranks
+    city = metrics.city[4]
+    dense, distinct, pct = ranks.rank(city, 'Total Cost')
+    values = table['Total Cost']
+    assert dense == values.rank(method='dense')[4]
+    assert distinct == values.nunique()
+    assert pct == pytest.approx(values.rank(method='max')[4] / values.notna().sum() * 100, abs=0.01)
+    frame = ranks.city_ranks(city)
+    assert frame['Column'].tolist() == ranks.columns
+    with pytest.raises(KeyError):
+        ranks.rank('Nowhere', 'Total Cost')
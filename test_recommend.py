@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from recommend import DEFAULT_WEIGHTS, basket_cost, recommend
+
+
+def brute_force(metrics, weights, budget=None, k=5):
+    prices = metrics.price_frame(metrics.items).set_index('City').fillna(0)
+    cost = sum(prices[item] * w for item, w in weights.items())
+    score = (pd.Series(metrics.metric('Salary'), index=cost.index) / cost).replace([np.inf, -np.inf], np.nan).fillna(0)
+    frame = pd.DataFrame({'cost': cost, 'score': score, 'pos': np.arange(len(cost))})
+    if budget:
+        frame = frame[frame['cost'] <= budget]
+    return frame.sort_values(['score', 'pos'], ascending=[False, True]).head(k)
+
+
+def test_default_ranking_matches_brute_force(metrics):
+    got = recommend(metrics, k=7)
+    expected = brute_force(metrics, DEFAULT_WEIGHTS, k=7)
+    assert got['City'].tolist() == expected.index.tolist()
+    np.testing.assert_allclose(got['Affordability Score'], expected['score'])
+    np.testing.assert_allclose(got['Basket Cost'], expected['cost'])
+
+
+def test_custom_weights_and_budget(metrics):
+    weights = {metrics.items[3]: 2.0, metrics.items[10]: 0.5, metrics.items[20]: 0}
+    budget = float(np.median(basket_cost(metrics, weights)))
+    got = recommend(metrics, weights, budget, k=100)
+    expected = brute_force(metrics, weights, budget, k=100)
+    assert got['City'].tolist() == expected.index.tolist()
+    assert (got['Basket Cost'] <= budget).all()
+
+
+def test_basket_cost_is_a_matrix_product(metrics):
+    weights = {item: float(j % 3) for j, item in enumerate(metrics.items)}
+    expected = np.nan_to_num(metrics.prices) @ np.array(list(weights.values()))
+    np.testing.assert_allclose(basket_cost(metrics, weights), expected)
+    np.testing.assert_array_equal(basket_cost(metrics, {}), np.zeros(len(metrics)))
@@ -0,0 +1,31 @@
+import queue
+
+from conftest import edit_prices, write_csv
+from refresh import DataWatcher, describe
+
+
+def test_watcher_applies_each_change_as_a_row_delta(data_file, raw):
+    seen = queue.Queue()
+    watcher = DataWatcher(data_file, interval=0.02)
+    watcher.add_listener(seen.put)
+    watcher.start()
+    try:
+        first = seen.get(timeout=10)
+        assert first.parent_version is None
+        assert describe(first).endswith(f"full reload ({len(raw):,} cities)")
+
+        write_csv(data_file, edit_prices(raw, [2, 5]))
+        second = seen.get(timeout=10)
+        assert second.parent_version == first.version
+        assert second.changed == {raw.loc[2, 'City'], raw.loc[5, 'City']}
+        assert "2 cities patched" in describe(second)
+
+        # A touch that leaves the bytes alone is not a new version
+        write_csv(data_file, edit_prices(raw, [2, 5]))
+        write_csv(data_file, edit_prices(raw, [9]))
+        third = seen.get(timeout=10)
+        assert third.parent_version == second.version
+        assert third.changed == {raw.loc[2, 'City'], raw.loc[5, 'City'], raw.loc[9, 'City']}
+    finally:
+        watcher.stop()
+        watcher.join(timeout=5)
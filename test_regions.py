@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from city_map import REGIONS
+from city_metrics import load_city_metrics
+from conftest import edit_prices, write_csv
+from cost_data import seed_baseline
+from regions import STATS, RegionStats, load_region_stats
+
+
+def grouped(metrics) -> pd.DataFrame:
+    table = pd.concat([metrics.frame(), metrics.price_frame(metrics.items).drop(columns='City')], axis=1)
+    return table.drop(columns='City').groupby('Region', observed=True)
+
+
+def assert_same_stats(a: RegionStats, b: RegionStats):
+    assert a.columns == b.columns
+    np.testing.assert_allclose(a.table, b.table, equal_nan=True)
+    for region in REGIONS:
+        np.testing.assert_array_equal(a.rows[region], b.rows[region])
+
+
+def test_stats_match_pandas_groupby(metrics):
+    stats = RegionStats(metrics)
+    groups = grouped(metrics)
+    assert stats.present() == [r for r in REGIONS if r in groups.groups]
+    expected = {'count': groups.count(), 'mean': groups.mean(), 'min': groups.min(), 'max': groups.max(),
+                'p25': groups.quantile(0.25), 'median': groups.median(), 'p75': groups.quantile(0.75)}
+    for stat in STATS:
+        got = stats.stat_frame(stat)
+        np.testing.assert_allclose(got.to_numpy(), expected[stat].loc[got.index, got.columns].to_numpy(), equal_nan=True)
+
+
+def test_lookups(metrics):
+    stats = load_region_stats(metrics)
+    assert load_region_stats(metrics) is stats
+    west = stats.cities_in('West')
+    assert set(west) == {c for c, r in zip(metrics.city, metrics.region) if r == 'West'}
+    summary = stats.summary('West', ['Rent', 'Total Cost'])
+    assert summary['Column'].tolist() == ['Rent', 'Total Cost'] and summary['count'].tolist() == [len(west)] * 2
+    ranked = stats.rank_regions('Total Cost')
+    assert (np.diff(ranked['Total Cost']) >= 0).all() and ranked['Rank'].iloc[0] == 1
+    assert stats.rank_regions('Total Cost', descending=True)['Region'].tolist() == ranked['Region'].tolist()[::-1]
+
+
+@pytest.mark.parametrize('edited_rows', [[0, 1], [40, 41]])
+def test_patched_stats_equal_a_full_build(data_file, raw, edited_rows):
+    seed_baseline(data_file)
+    before = load_city_metrics(data_file)
+    load_region_stats(before)
+    write_csv(data_file, edit_prices(raw, edited_rows))
+    after = load_city_metrics(data_file)
+    assert after.parent_version == before.version
+    assert_same_stats(load_region_stats(after), RegionStats(after))
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scenarios import evaluate_scenarios, scenario_template
+
+
+def test_cost_surplus_and_fit_for_every_scenario_and_city(metrics):
+    items = metrics.items
+    scenarios = pd.DataFrame({'Scenario': ['single', 'family'], 'Budget': [20_000, 90_000],
+                              items[0]: [4, 10], items[5]: [None, 2], items[9]: ['1.5', 0]})
+    result = evaluate_scenarios(metrics, scenarios)
+    q = np.zeros((2, len(items)))
+    q[:, [0, 5, 9]] = [[4, 0, 1.5], [10, 2, 0]]
+    cost = q @ np.nan_to_num(metrics.prices).T
+    np.testing.assert_allclose(result.cost.to_numpy(), cost)
+    np.testing.assert_allclose(result.surplus.to_numpy(), np.array([[20_000], [90_000]]) - cost)
+    np.testing.assert_array_equal(result.fit.to_numpy(), cost <= np.array([[20_000], [90_000]]))
+    assert result.fit.index.tolist() == ['single', 'family']
+    assert result.fit.columns.tolist() == metrics.city.tolist()
+
+
+@pytest.mark.parametrize('bad, error', [
+    ({'Budget': ['x', 1]}, ValueError),
+    ({'Budget': [None, 1]}, ValueError),
+    ({'QTY': ['two', 3]}, ValueError),
+    ({'Not an item': [1, 1]}, KeyError),
+])
+def test_bad_sheets_are_rejected(metrics, bad, error):
+    scenarios = pd.DataFrame({'Budget': [10_000, 20_000], metrics.items[0]: [1, 2]})
+    scenarios = scenarios.assign(**{metrics.items[1] if col == 'QTY' else col: v for col, v in bad.items()})
+    with pytest.raises(error):
+        evaluate_scenarios(metrics, scenarios)
+
+
+def test_missing_budget_column(metrics):
+    with pytest.raises(KeyError):
+        evaluate_scenarios(metrics, pd.DataFrame({metrics.items[0]: [1]}))
+    assert scenario_template(metrics).columns.tolist() == ['Scenario', 'Budget'] + metrics.items
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from snapshots import KEYFRAME_EVERY, SnapshotStore
+
+
+def versions(n: int, seed: int = 0) -> list:
+    """``n`` price tables drifting over time; cities and items come and go, some cells go missing."""
+    rng = np.random.default_rng(seed)
+    cities = [f"City {i}" for i in range(40)]
+    items = [f"Item {j}" for j in range(8)]
+    prices = pd.DataFrame(rng.uniform(10, 1000, (len(cities), len(items))), index=cities, columns=items)
+    tables = []
+    for k in range(n):
+        change = rng.random(prices.shape) < 0.1
+        prices = prices.where(~change, prices * rng.uniform(0.9, 1.2, prices.shape))
+        table = prices.copy()
+        table.iloc[rng.integers(0, len(cities), 3), rng.integers(0, len(items), 3)] = np.nan
+        if k % 4 == 1:
+            table = table.drop(index=cities[k % len(cities)])
+        if k % 5 == 2:
+            table.loc[f"New {k}"] = rng.uniform(10, 1000, len(items))
+        if k == 7:
+            table = table.drop(columns=items[0]).assign(**{'Item new': rng.uniform(10, 1000, len(table))})
+        tables.append(table.rename_axis('City').reset_index())
+    return tables
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = SnapshotStore(str(tmp_path / "prices.snapshots"))
+    tables = versions(2 * KEYFRAME_EVERY + 3)
+    for k, table in enumerate(tables):
+        assert store.append(table, f"v{k}", taken_at=pd.Timestamp('2025-01-01') + pd.Timedelta(days=k))
+    return store, tables
+
+
+def test_every_snapshot_rebuilds_its_table(history):
+    store, tables = history
+    assert len(store) == len(tables)
+    assert store.catalog()['keyframe'].tolist() == [k % KEYFRAME_EVERY == 0 for k in range(len(tables))]
+    for k, table in enumerate(tables):
+        got = store.frame(k).set_index('City')
+        expected = table.set_index('City').reindex(columns=store.items)
+        assert sorted(got.index) == sorted(expected.index)
+        pd.testing.assert_frame_equal(got.loc[expected.index], expected, check_names=False)
+
+
+def test_deltas_store_only_changed_cells(history):
+    store, tables = history
+    cells = store.catalog().set_index('id')['cells']
+    full = int(tables[0].drop(columns='City').notna().to_numpy().sum())
+    assert cells[0] == full
+    assert cells[1] < full / 2
+
+
+def test_same_version_is_not_stored_twice(history):
+    store, tables = history
+    assert not store.append(tables[-1], f"v{len(tables) - 1}")
+    assert len(store) == len(tables)
+    # A new store on the same directory reads the catalog back
+    again = SnapshotStore(store.root)
+    pd.testing.assert_frame_equal(again.frame(3), store.frame(3))
+
+
+def test_trend_matches_the_frames(history):
+    store, tables = history
+    city, item = 'City 3', 'Item 2'
+    trend = store.trend(city, item)
+    expected = [table.set_index('City')[item].get(city, np.nan) for table in tables]
+    np.testing.assert_array_equal(trend.to_numpy(), expected)
+    last = store.trend(city, item, last=5)
+    np.testing.assert_array_equal(last.to_numpy(), expected[-5:])
+    assert store.trend('Nowhere', item).empty
+
+
+def test_inflation_is_the_median_change_per_item(history):
+    store, tables = history
+    first = tables[0].set_index('City').reindex(columns=store.items)
+    latest = tables[-1].set_index('City').reindex(index=first.index, columns=store.items)
+    change = (latest / first - 1) * 100
+    expected = change.median().dropna().sort_values(ascending=False).head(3)
+    got = store.inflation(k=3)
+    assert got['Item'].tolist() == expected.index.tolist()
+    np.testing.assert_allclose(got['Change (%)'], expected.to_numpy())
@@ -0,0 +1,158 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+PREVIEW_ROWS = 1000
+CHUNK_ROWS = 50_000
+# Upload jobs kept in memory, most recently used last (each holds a preview and a summary, not the data)
+MAX_CACHED_UPLOADS = 4
+
+
+def _common_dtype(a, b):
+    """dtype a column ends up with when chunks parsed as ``a`` and ``b`` are combined."""
+    if a == b:
+        return a
+    try:
+        return np.result_type(a, b)
+    except TypeError:
+        return np.dtype(object)
+
+
+class UploadJob:
+    """Background parse of one uploaded CSV, shared by every rerun that sees the same bytes.
+
+    The chunks are only summarised (row count, per-column dtype); the
+    parsed data is not kept, so a finished job costs its preview only.
+    """
+
+    def __init__(self, digest: str, payload: bytes):
+        self.digest = digest
+        self.size = len(payload)
+        self.preview = None
+        self.schema = None
+        self.dtypes = {}
+        self.error = None
+        self.rows_read = 0
+        self.bytes_read = 0
+        self.done = threading.Event()
+        self._payload = payload
+
+    @property
+    def progress(self) -> float:
+        if self.done.is_set():
+            return 1.0
+        return min(self.bytes_read / self.size, 1.0) if self.size else 0.0
+
+    def sniff(self):
+        """Parse just the first rows so a preview and column types can be shown right away."""
+        self.preview = pd.read_csv(io.BytesIO(self._payload), nrows=PREVIEW_ROWS)
+        self.schema = pd.DataFrame({'Column': self.preview.columns, 'Type': self.preview.dtypes.astype(str).to_numpy()})
+
+    def run(self):
+        buffer = io.BytesIO(self._payload)
+        dtypes = dict(self.preview.dtypes.items())
+        try:
+            for chunk in pd.read_csv(buffer, chunksize=CHUNK_ROWS):
+                for col, dtype in chunk.dtypes.items():
+                    dtypes[col] = _common_dtype(dtypes.get(col, dtype), dtype)
+                self.rows_read += len(chunk)
+                self.bytes_read = buffer.tell()
+            self.dtypes = dtypes
+            # Types over the whole file, which can differ from what the preview rows suggested
+            self.schema = pd.DataFrame({'Column': list(dtypes), 'Type': [str(t) for t in dtypes.values()]})
+        except Exception as e:  # reported in the UI instead of killing the worker silently
+            self.error = e
+        finally:
+            # The raw bytes are no longer needed once parsed
+            self._payload = None
+            self.done.set()
+
+
+_jobs = OrderedDict()
+# Streamlit file_id -> content digest, so a rerun finds its job without re-reading and re-hashing the upload
+_file_ids = {}
+_lock = threading.Lock()
+
+
+def upload_digest(payload: bytes) -> str:
+    return hashlib.sha1(payload).hexdigest()
+
+
+def start_upload(uploaded_file) -> UploadJob:
+    """Return the parse job for an upload, starting it only the first time its content is seen.
+
+    The preview is parsed synchronously (it is small); the full file is
+    parsed in chunks on a daemon thread that keeps only its row count and
+    column types, not the data. Jobs (preview + summary) are cached by
+    content hash, so reruns and other sessions uploading the same file
+    reuse them; a rerun of the same upload is matched by its file_id
+    before any bytes are read.
+    """
+    file_id = getattr(uploaded_file, 'file_id', None)
+    with _lock:
+        job = _jobs.get(_file_ids.get(file_id))
+        if job is not None:
+            _jobs.move_to_end(job.digest)
+            return job
+
+    payload = uploaded_file.getvalue()
+    digest = upload_digest(payload)
+    with _lock:
+        job = _jobs.get(digest)
+        if job is not None:
+            _jobs.move_to_end(digest)
+            if file_id is not None:
+                _file_ids[file_id] = digest
+            return job
+
+    job = UploadJob(digest, payload)
+    try:
+        job.sniff()
+    except Exception as e:
+        job.error = e
+        job._payload = None
+        job.done.set()
+
+    with _lock:
+        if file_id is not None:
+            _file_ids[file_id] = digest
+        if digest in _jobs:
+            # Another rerun got there first
+            return _jobs[digest]
+        _jobs[digest] = job
+        while len(_jobs) > MAX_CACHED_UPLOADS:
+            _jobs.popitem(last=False)
+        for stale in [fid for fid, d in _file_ids.items() if d not in _jobs]:
+            del _file_ids[stale]
+    if not job.done.is_set():
+        threading.Thread(target=job.run, name=f"upload-{digest[:8]}", daemon=True).start()
+    return job
+
+
+def render_upload(uploaded_file):
+    """Preview, progress and summary for the 'Upload Your Data' tab."""
+    import streamlit as st
+
+    job = start_upload(uploaded_file)
+    if job.preview is None:
+        st.error(f"Failed to read CSV: {job.error}")
+        return job
+
+    st.write("First 5 rows of uploaded data:")
+    st.dataframe(job.preview.head())
+    with st.expander("Detected columns"):
+        st.dataframe(job.schema)
+
+    if not job.done.is_set():
+        st.progress(job.progress, text=f"Parsing… {job.rows_read:,} rows so far")
+        st.button("Refresh progress")
+    elif job.error is not None:
+        st.error(f"Failed to read the full CSV: {job.error}")
+    else:
+        st.success(f"Parsed {job.rows_read:,} rows × {len(job.dtypes)} columns.")
+    return job